@@ -1,9 +1,25 @@
-from typing import List, Optional, Tuple
-from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
+import random
 from .pieces import Piece
 from .utils import Color, PieceType, Move, file_labels
 
 
+# Zobrist keys use a fixed seed so hashes are stable between runs.
+_zobrist_rng = random.Random(0x5A0B)
+ZOBRIST_PIECES: Dict[Tuple[Color, PieceType], List[int]] = {
+    (color, kind): [_zobrist_rng.getrandbits(64) for _ in range(64)]
+    for color in Color
+    for kind in PieceType
+}
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+ZOBRIST_CASTLING: Dict[Tuple[Color, str], int] = {
+    (color, side): _zobrist_rng.getrandbits(64)
+    for color in Color
+    for side in ("K", "Q")
+}
+ZOBRIST_EP_FILE = [_zobrist_rng.getrandbits(64) for _ in range(8)]
+
+
 class Board:
     def __init__(self) -> None:
         self.grid: List[List[Optional[Piece]]] = [
@@ -17,10 +33,20 @@ class Board:
         self.en_passant_target: Optional[Tuple[int, int]] = None
         self.halfmove_clock: int = 0
         self.fullmove_number: int = 1
+        # One bitboard per color and kind, bit index = row * 8 + col.
+        self.bitboards: Dict[Color, Dict[PieceType, int]] = {
+            Color.WHITE: {kind: 0 for kind in PieceType},
+            Color.BLACK: {kind: 0 for kind in PieceType},
+        }
+        # Zobrist hash of the piece placement only, kept in step with set_piece.
+        self.piece_hash: int = 0
 
     def copy(self) -> "Board":
         clone = Board()
-        clone.grid = deepcopy(self.grid)
+        clone.grid = [
+            [None if piece is None else Piece(piece.color, piece.kind, piece.has_moved) for piece in row]
+            for row in self.grid
+        ]
         clone.current_player = self.current_player
         clone.castling_rights = {
             Color.WHITE: self.castling_rights[Color.WHITE].copy(),
@@ -29,12 +55,17 @@ class Board:
         clone.en_passant_target = self.en_passant_target
         clone.halfmove_clock = self.halfmove_clock
         clone.fullmove_number = self.fullmove_number
+        clone.bitboards = {
+            Color.WHITE: self.bitboards[Color.WHITE].copy(),
+            Color.BLACK: self.bitboards[Color.BLACK].copy(),
+        }
+        clone.piece_hash = self.piece_hash
         return clone
 
     def setup_initial(self) -> None:
         for col in range(8):
-            self.grid[1][col] = Piece(Color.BLACK, PieceType.PAWN)
-            self.grid[6][col] = Piece(Color.WHITE, PieceType.PAWN)
+            self.set_piece(1, col, Piece(Color.BLACK, PieceType.PAWN))
+            self.set_piece(6, col, Piece(Color.WHITE, PieceType.PAWN))
         back_rank = [
             PieceType.ROOK,
             PieceType.KNIGHT,
@@ -46,13 +77,22 @@ class Board:
             PieceType.ROOK,
         ]
         for col, kind in enumerate(back_rank):
-            self.grid[0][col] = Piece(Color.BLACK, kind)
-            self.grid[7][col] = Piece(Color.WHITE, kind)
+            self.set_piece(0, col, Piece(Color.BLACK, kind))
+            self.set_piece(7, col, Piece(Color.WHITE, kind))
 
     def get_piece(self, row: int, col: int) -> Optional[Piece]:
         return self.grid[row][col]
 
     def set_piece(self, row: int, col: int, piece: Optional[Piece]) -> None:
+        index = row * 8 + col
+        bit = 1 << index
+        old = self.grid[row][col]
+        if old is not None:
+            self.bitboards[old.color][old.kind] &= ~bit
+            self.piece_hash ^= ZOBRIST_PIECES[(old.color, old.kind)][index]
+        if piece is not None:
+            self.bitboards[piece.color][piece.kind] |= bit
+            self.piece_hash ^= ZOBRIST_PIECES[(piece.color, piece.kind)][index]
         self.grid[row][col] = piece
 
     def iter_squares(self):
@@ -102,6 +142,20 @@ class Board:
             
         return f"{board_fen} {active} {castling} {ep} {self.halfmove_clock} {self.fullmove_number}"
 
+    def zobrist_key(self) -> int:
+        key = self.piece_hash
+        if self.current_player is Color.BLACK:
+            key ^= ZOBRIST_SIDE
+        for color in Color:
+            rights = self.castling_rights[color]
+            if rights["K"]:
+                key ^= ZOBRIST_CASTLING[(color, "K")]
+            if rights["Q"]:
+                key ^= ZOBRIST_CASTLING[(color, "Q")]
+        if self.en_passant_target is not None:
+            key ^= ZOBRIST_EP_FILE[self.en_passant_target[1]]
+        return key
+
     def board_key(self) -> str:
         rows = []
         for row in range(8):
@@ -1,29 +1,52 @@
 import subprocess
 import os
+import re
 import threading
-import queue
 import time
 import random
+from collections import deque
 from typing import Optional, Dict, List
 
+# Path Resolution
+# chess_game/engine/lc0_engine.py -> chess_game/engine
+ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+# chess_game/engine -> chess_game
+CHESS_GAME_DIR = os.path.dirname(ENGINE_DIR)
+# chess_game -> ProjectRoot
+PROJECT_ROOT = os.path.dirname(CHESS_GAME_DIR)
+
+LC0_EXE = os.path.join(PROJECT_ROOT, "engines", "lc0.exe")
+NETWORK_PATH = os.path.join(PROJECT_ROOT, "engines", "791556.pb.gz")
+
+# Queued by the reader thread when the engine's stdout closes
+_EOF = object()
+
+# UCI info fields read from MultiPV lines
+_MPV_RE = re.compile(r" multipv (\d+)")
+_PV_RE = re.compile(r" pv (\S+)")
+
+# Board, side to move, castling, en passant, then optional move clocks
+_FEN_RE = re.compile(
+    r"^((?:[rnbqkpRNBQKP1-8]+/){7}[rnbqkpRNBQKP1-8]+) [wb] (?:-|K?Q?k?q?) (?:-|[a-h][36])(?: \d+ \d+)?$"
+)
+
 class LC0Engine:
     def __init__(self):
         self.process: Optional[subprocess.Popen] = None
-        self.output_queue = queue.Queue()
+        # Single producer (reader thread), single consumer (the searching caller)
+        self._lines: deque = deque()
+        self._data_evt = threading.Event()
         self.is_running = False
-        self.is_searching = False
+        # Serializes searches: a second caller waits its turn instead of being dropped
+        self._search_lock = threading.Lock()
         self._reader_thread = None
+        self._current_multipv = 1
+        # Whether the current search needs MultiPV info lines from the reader
+        self._want_multipv = False
+        self._stdin_fd: Optional[int] = None
         
-        # Path Resolution
-        # chess_game/engine/lc0_engine.py -> chess_game/engine
-        ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
-        # chess_game/engine -> chess_game
-        CHESS_GAME_DIR = os.path.dirname(ENGINE_DIR)
-        # chess_game -> ProjectRoot
-        PROJECT_ROOT = os.path.dirname(CHESS_GAME_DIR)
-        
-        self.lc0_exe = os.path.join(PROJECT_ROOT, "engines", "lc0.exe")
-        self.network_path = os.path.join(PROJECT_ROOT, "engines", "791556.pb.gz")
+        self.lc0_exe = LC0_EXE
+        self.network_path = NETWORK_PATH
         
         if not os.path.exists(self.lc0_exe):
             raise FileNotFoundError(f"LC0 executable not found at: {self.lc0_exe}")
@@ -36,10 +59,15 @@ class LC0Engine:
         # Start LC0 with the weights file argument
         cmd = [self.lc0_exe, f"--weights={self.network_path}"]
         
-        # Creation flag for Windows to not show console window
+        # On Windows: no console window. The engine gets its own hidden console, so console
+        # control events can't reach it; quit() falls back to kill() if "quit" is ignored
         creationflags = 0
+        startupinfo = None
         if os.name == 'nt':
             creationflags = subprocess.CREATE_NO_WINDOW
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
             
         self.process = subprocess.Popen(
             cmd,
@@ -47,84 +75,132 @@ class LC0Engine:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             universal_newlines=True,
-            bufsize=1,
-            creationflags=creationflags
+            bufsize=65536,
+            creationflags=creationflags,
+            startupinfo=startupinfo
         )
         self.is_running = True
+        # Commands are written straight to the pipe, bypassing the text wrapper
+        self._stdin_fd = self.process.stdin.fileno()
+        
+        # Fresh buffer per process so a previous reader's EOF can't leak into this one
+        self._lines = deque()
+        self._data_evt = threading.Event()
         
         # Start reader thread
-        self._reader_thread = threading.Thread(target=self._read_output, daemon=True)
+        self._reader_thread = threading.Thread(
+            target=self._read_output, args=(self.process, self._lines, self._data_evt), daemon=True
+        )
         self._reader_thread.start()
         
+        # A fresh process starts with the engine's default MultiPV
+        self._current_multipv = 1
+        
         # Initialize UCI
         self.send_command("uci")
         self._wait_for("uciok", timeout=5)
 
-    def _read_output(self):
-        """Reads stdout from the engine and puts lines into a queue."""
-        while self.is_running and self.process:
-            try:
-                line = self.process.stdout.readline()
-                if not line:
+    def _read_output(self, process: subprocess.Popen, lines: deque, data_evt: threading.Event):
+        """Reads stdout from the engine and appends lines for the consumer."""
+        try:
+            # Iterating the buffered pipe reads large chunks and splits lines in C
+            for line in process.stdout:
+                if not self.is_running:
                     break
-                self.output_queue.put(line.strip())
-            except Exception:
-                break
+                # Info lines are only read for MultiPV candidates; drop the rest here
+                if line.startswith("info") and not (self._want_multipv and " multipv " in line):
+                    continue
+                lines.append(line.strip())
+                data_evt.set()
+        except Exception:
+            pass
+        finally:
+            lines.append(_EOF)
+            data_evt.set()
 
     def send_command(self, command: str):
         """Sends a command to the engine."""
         if self.process and self.process.stdin:
             try:
-                self.process.stdin.write(f"{command}\n")
-                self.process.stdin.flush()
+                data = f"{command}\n".encode("ascii")
+                while data:
+                    written = os.write(self._stdin_fd, data)
+                    data = data[written:]
             except Exception as e:
                 print(f"Error sending command to engine: {e}")
 
+    def _next_line(self, deadline_ns: int):
+        """Blocks for the next engine line; returns None once the deadline passes."""
+        lines = self._lines
+        data_evt = self._data_evt
+        while True:
+            if lines:
+                return lines.popleft()
+            remaining_ns = deadline_ns - time.monotonic_ns()
+            if remaining_ns <= 0:
+                return None
+            data_evt.wait(remaining_ns / 1_000_000_000)
+            # Anything appended before this clear is seen by the check above
+            data_evt.clear()
+
     def _wait_for(self, target_text: str, timeout: float = 2.0) -> bool:
         """Waits for specific text in the output."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                # Peek at queue or consume? We generally consume uci handshake
-                # For simplicity in this synchronous init phase, we consume.
-                line = self.output_queue.get(timeout=0.1)
-                if target_text in line:
+        deadline_ns = time.monotonic_ns() + int(timeout * 1_000_000_000)
+        while True:
+            # We generally consume the uci handshake in this synchronous init phase
+            line = self._next_line(deadline_ns)
+            if line is None or line is _EOF:
+                return False
+            if target_text in line:
+                return True
+
+    def soft_reset(self) -> bool:
+        """
+        Clears the engine's game state with ucinewgame, keeping the process and its
+        loaded network. Escalates to hard_restart() if the engine doesn't answer isready.
+        """
+        with self._search_lock:
+            if self.process is not None and self.process.poll() is None:
+                self._lines.clear()
+                self.send_command("ucinewgame")
+                self.send_command("isready")
+                if self._wait_for("readyok", timeout=2.0):
                     return True
-            except queue.Empty:
-                continue
-        return False
+            self.hard_restart()
+            return False
 
-    def restart(self):
-        """Restarts the engine process."""
+    def hard_restart(self):
+        """Restarts the engine process, reloading the network. For crashed or hung engines."""
         self.quit()
         time.sleep(0.2)
         self._start_engine()
 
     def _validate_fen(self, fen: str) -> bool:
-        """Basic FEN validation."""
-        parts = fen.split()
-        if len(parts) < 2: return False
-        ranks = parts[0].split('/')
-        if len(ranks) != 8: return False
-        if parts[1] not in ['w', 'b']: return False
-        return True
-
-    def get_best_move(self, fen: str, limits: Optional[Dict] = None) -> Optional[str]:
+        """Basic FEN validation: field syntax plus eight squares per rank."""
+        match = _FEN_RE.match(fen)
+        if match is None:
+            return False
+        return all(
+            sum(int(ch) if ch.isdigit() else 1 for ch in rank) == 8
+            for rank in match.group(1).split('/')
+        )
+
+    def get_best_move(self, fen: str, limits: Optional[Dict] = None, moves: Optional[List[str]] = None) -> Optional[str]:
         """
         Sends position and go command, waits for bestmove.
+        `fen` is the root position and `moves` the UCI moves played from it, so the
+        engine sees the game as one line and can reuse its search tree between plies.
         Supported limits: 'movetime', 'nodes', 'multipv'
         If 'multipv' > 1, it will pick a random move from the top N candidates (simulated 'noise').
         """
-        if self.is_searching:
-            print("Engine busy: Search already in progress")
-            return None
-            
         if not self._validate_fen(fen):
             print(f"Invalid FEN: {fen}")
             return None
 
-        self.is_searching = True
-        
+        with self._search_lock:
+            return self._search(fen, limits, moves)
+
+    def _search(self, fen: str, limits: Optional[Dict], moves: Optional[List[str]]) -> Optional[str]:
         # Default limits
         if isinstance(limits, int):
             limits = {'movetime': limits}
@@ -136,15 +212,16 @@ class LC0Engine:
         candidates = {}  # Map multipv_id -> move
         
         try:
-            # Clear queue
-            with self.output_queue.mutex:
-                self.output_queue.queue.clear()
+            # Clear stale output
+            self._lines.clear()
                 
-            # Configure MultiPV if needed
-            if multipv > 1:
+            # Let MultiPV info lines through the reader only when they are used
+            self._want_multipv = multipv > 1
+            
+            # Configure MultiPV only when it changes
+            if multipv != self._current_multipv:
                 self.send_command(f"setoption name MultiPV value {multipv}")
-            else:
-                self.send_command("setoption name MultiPV value 1")
+                self._current_multipv = multipv
             
             # Build go command
             cmd = "go"
@@ -153,7 +230,10 @@ class LC0Engine:
             else:
                 cmd += f" movetime {movetime}"
                 
-            self.send_command(f"position fen {fen}")
+            position = f"position fen {fen}"
+            if moves:
+                position += " moves " + " ".join(moves)
+            self.send_command(position)
             self.send_command(cmd)
             
             # Timeout safety
@@ -165,58 +245,67 @@ class LC0Engine:
                 # If movetime is strict, use it + buffer
                 safety_timeout = (limits['movetime'] / 1000.0) + 2.0
             
-            start_time = time.time()
+            deadline_ns = time.monotonic_ns() + int(safety_timeout * 1_000_000_000)
             
-            while time.time() - start_time < safety_timeout:
-                try:
-                    line = self.output_queue.get(timeout=0.1)
+            while True:
+                line = self._next_line(deadline_ns)
+                if line is None:
+                    break
+                if line is _EOF:
+                    print("Engine exited during search.")
+                    return None
+                
+                # Collect MultiPV candidates
+                # Format: info depth X ... multipv N ... pv e2e4 ...
+                if multipv > 1 and line.startswith("info "):
+                     pv_match = _PV_RE.search(line)
+                     if pv_match:
+                         mpv_match = _MPV_RE.search(line)
+                         mpv_id = int(mpv_match.group(1)) if mpv_match else 1
+                         candidates[mpv_id] = pv_match.group(1)
+
+                if line.startswith("bestmove"):
+                    # "bestmove <move> [ponder <move>]": slice out the move token
+                    rest = line[9:]
+                    space = rest.find(' ')
+                    best_move = (rest if space < 0 else rest[:space]) or None
                     
-                    # Collect MultiPV candidates
-                    # Format: info depth X ... multipv N ... pv e2e4 ...
-                    if multipv > 1 and "pv" in line and "info" in line:
-                         parts = line.split()
-                         try:
-                             # Extract MultiPV ID
-                             mpv_id = 1
-                             if "multipv" in parts:
-                                 mpv_idx = parts.index("multipv")
-                                 if mpv_idx + 1 < len(parts):
-                                     mpv_id = int(parts[mpv_idx + 1])
-                             
-                             # Extract Move
-                             pv_index = parts.index("pv")
-                             if pv_index + 1 < len(parts):
-                                 m = parts[pv_index + 1]
-                                 candidates[mpv_id] = m
-                         except (ValueError, IndexError):
-                             pass
-
-                    if line.startswith("bestmove"):
-                        parts = line.split()
-                        best_move = parts[1] if len(parts) >= 2 else None
-                        
-                        if multipv > 1 and candidates:
-                             # Pick random from the latest Top N candidates
-                             # We have candidates[1] (best), candidates[2] (2nd best), etc.
-                             # If we asked for MultiPV 3, we should have keys 1, 2, 3.
-                             # But maybe only 1 and 2 if 3 is bad.
-                             available_moves = list(candidates.values())
-                             if available_moves:
-                                 # User said: "Easy -> pick from top 3"
-                                 # Our AI_LEVELS sets multipv=3 for Easy.
-                                 # So we just pick randomly from whatever we have.
-                                 return random.choice(available_moves)
-                        
-                        return best_move
-                        
-                except queue.Empty:
-                    continue
-            
+                    if multipv > 1 and candidates:
+                         # Pick random from the latest Top N candidates
+                         # We have candidates[1] (best), candidates[2] (2nd best), etc.
+                         # If we asked for MultiPV 3, we should have keys 1, 2, 3.
+                         # But maybe only 1 and 2 if 3 is bad.
+                         available_moves = list(candidates.values())
+                         if available_moves:
+                             # User said: "Easy -> pick from top 3"
+                             # Our AI_LEVELS sets multipv=3 for Easy.
+                             # So we just pick randomly from whatever we have.
+                             return random.choice(available_moves)
+                    
+                    return best_move
+        
             print("Engine timeout.")
+            self._abandon_search()
             return None
             
         finally:
-            self.is_searching = False
+            self._want_multipv = False
+
+    def _abandon_search(self):
+        """
+        Stops a search that overran its deadline and consumes its bestmove, so the late
+        reply can't be taken as the answer to the next position. Restarts the engine if
+        it doesn't stop.
+        """
+        self.send_command("stop")
+        deadline_ns = time.monotonic_ns() + 2_000_000_000
+        while True:
+            line = self._next_line(deadline_ns)
+            if line is None or line is _EOF:
+                break
+            if line.startswith("bestmove"):
+                return
+        self.hard_restart()
 
     def quit(self):
         """Stops the engine process."""
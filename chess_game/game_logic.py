@@ -1,10 +1,11 @@
 from typing import List, Optional, Tuple, Dict
+from dataclasses import dataclass
 from .board import Board
 from .pieces import Piece, piece_values
-from .utils import Color, PieceType, Move, square_to_indices, indices_to_square, format_move_san_like, file_labels
+from .utils import Color, PieceType, Move, square_to_indices, indices_to_square, format_move_san_like, file_labels, popcount, iter_bits
 
 
-def get_algebraic_notation(board: Board, move: Move) -> str:
+def get_algebraic_notation(board: Board, move: Move, legal_moves: Optional[List[Move]] = None) -> str:
     piece = board.get_piece(move.from_row, move.from_col)
     if piece is None:
         return ""
@@ -60,7 +61,7 @@ def get_algebraic_notation(board: Board, move: Move) -> str:
     # Disambiguation
     # Find other pieces of same type and color
     others = []
-    candidates = generate_legal_moves(board, piece.color)
+    candidates = legal_moves if legal_moves is not None else generate_legal_moves(board, piece.color)
     for m in candidates:
         if m.to_row == move.to_row and m.to_col == move.to_col:
             p = board.get_piece(m.from_row, m.from_col)
@@ -115,84 +116,80 @@ def in_bounds(row: int, col: int) -> bool:
 
 
 def locate_king(board: Board, color: Color) -> Optional[Tuple[int, int]]:
-    for row, col, piece in board.iter_squares():
-        if piece is not None and piece.color is color and piece.kind is PieceType.KING:
-            return row, col
-    return None
+    kings = board.bitboards[color][PieceType.KING]
+    if not kings:
+        return None
+    sq = (kings & -kings).bit_length() - 1
+    return sq >> 3, sq & 7
+
+
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+QUEEN_DIRECTIONS = BISHOP_DIRECTIONS + ROOK_DIRECTIONS
 
 
 def is_square_attacked(board: Board, row: int, col: int, by_color: Color) -> bool:
+    # Called for every candidate move during legal-move filtering, so the
+    # grid and piece kinds are bound to locals and bounds are checked inline.
+    grid = board.grid
+    pawn = PieceType.PAWN
+    knight = PieceType.KNIGHT
+    king = PieceType.KING
+    queen = PieceType.QUEEN
     pawn_dir = -1 if by_color is Color.WHITE else 1
     # Check for pawn attacks
     # A pawn at (row - pawn_dir, col +/- 1) attacks (row, col)
     # because it moves in pawn_dir.
     pawn_row = row - pawn_dir
-    if in_bounds(pawn_row, col):
-        for dc in (-1, 1):
-            pc = col + dc
-            if in_bounds(pawn_row, pc):
-                piece = board.get_piece(pawn_row, pc)
-                if piece is not None and piece.color is by_color and piece.kind is PieceType.PAWN:
+    if 0 <= pawn_row < 8:
+        pawn_rank = grid[pawn_row]
+        for pc in (col - 1, col + 1):
+            if 0 <= pc < 8:
+                piece = pawn_rank[pc]
+                if piece is not None and piece.color is by_color and piece.kind is pawn:
                     return True
-    
-    knight_offsets = [
-        (-2, -1),
-        (-2, 1),
-        (-1, -2),
-        (-1, 2),
-        (1, -2),
-        (1, 2),
-        (2, -1),
-        (2, 1),
-    ]
-    for dr, dc in knight_offsets:
+
+    for dr, dc in KNIGHT_OFFSETS:
         r = row + dr
         c = col + dc
-        if not in_bounds(r, c):
-            continue
-        piece = board.get_piece(r, c)
-        if piece is not None and piece.color is by_color and piece.kind is PieceType.KNIGHT:
-            return True
-    directions_rook = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    directions_bishop = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-    for dr, dc in directions_rook:
+        if 0 <= r < 8 and 0 <= c < 8:
+            piece = grid[r][c]
+            if piece is not None and piece.color is by_color and piece.kind is knight:
+                return True
+    rook = PieceType.ROOK
+    for dr, dc in ROOK_DIRECTIONS:
         r = row + dr
         c = col + dc
-        while in_bounds(r, c):
-            piece = board.get_piece(r, c)
+        while 0 <= r < 8 and 0 <= c < 8:
+            piece = grid[r][c]
             if piece is None:
                 r += dr
                 c += dc
                 continue
-            if piece.color is not by_color:
-                break
-            if piece.kind in (PieceType.ROOK, PieceType.QUEEN):
+            if piece.color is by_color and (piece.kind is rook or piece.kind is queen):
                 return True
             break
-    for dr, dc in directions_bishop:
+    bishop = PieceType.BISHOP
+    for dr, dc in BISHOP_DIRECTIONS:
         r = row + dr
         c = col + dc
-        while in_bounds(r, c):
-            piece = board.get_piece(r, c)
+        while 0 <= r < 8 and 0 <= c < 8:
+            piece = grid[r][c]
             if piece is None:
                 r += dr
                 c += dc
                 continue
-            if piece.color is not by_color:
-                break
-            if piece.kind in (PieceType.BISHOP, PieceType.QUEEN):
+            if piece.color is by_color and (piece.kind is bishop or piece.kind is queen):
                 return True
             break
-    for dr in (-1, 0, 1):
-        for dc in (-1, 0, 1):
-            if dr == 0 and dc == 0:
-                continue
-            r = row + dr
-            c = col + dc
-            if not in_bounds(r, c):
-                continue
-            piece = board.get_piece(r, c)
-            if piece is not None and piece.color is by_color and piece.kind is PieceType.KING:
+    for dr, dc in KING_OFFSETS:
+        r = row + dr
+        c = col + dc
+        if 0 <= r < 8 and 0 <= c < 8:
+            piece = grid[r][c]
+            if piece is not None and piece.color is by_color and piece.kind is king:
                 return True
     return False
 
@@ -249,17 +246,7 @@ def generate_knight_moves(board: Board, row: int, col: int, moves: List[Move]) -
     if piece is None:
         return
     color = piece.color
-    offsets = [
-        (-2, -1),
-        (-2, 1),
-        (-1, -2),
-        (-1, 2),
-        (1, -2),
-        (1, 2),
-        (2, -1),
-        (2, 1),
-    ]
-    for dr, dc in offsets:
+    for dr, dc in KNIGHT_OFFSETS:
         r = row + dr
         c = col + dc
         if not in_bounds(r, c):
@@ -275,24 +262,26 @@ def generate_sliding_moves(
     board: Board,
     row: int,
     col: int,
-    directions: List[Tuple[int, int]],
+    directions: Tuple[Tuple[int, int], ...],
     moves: List[Move],
 ) -> None:
-    piece = board.get_piece(row, col)
+    grid = board.grid
+    piece = grid[row][col]
     if piece is None:
         return
     color = piece.color
+    king = PieceType.KING
+    append = moves.append
     for dr, dc in directions:
         r = row + dr
         c = col + dc
-        while in_bounds(r, c):
-            target = board.get_piece(r, c)
+        while 0 <= r < 8 and 0 <= c < 8:
+            target = grid[r][c]
             if target is None:
-                moves.append(Move(row, col, r, c))
+                append(Move(row, col, r, c))
             else:
-                if target.color is not color:
-                    if target.kind is not PieceType.KING:
-                        moves.append(Move(row, col, r, c))
+                if target.color is not color and target.kind is not king:
+                    append(Move(row, col, r, c))
                 break
             r += dr
             c += dc
@@ -303,31 +292,29 @@ def generate_king_moves(board: Board, row: int, col: int, moves: List[Move]) ->
     if piece is None:
         return
     color = piece.color
-    for dr in (-1, 0, 1):
-        for dc in (-1, 0, 1):
-            if dr == 0 and dc == 0:
-                continue
-            r = row + dr
-            c = col + dc
-            if not in_bounds(r, c):
+    for dr, dc in KING_OFFSETS:
+        r = row + dr
+        c = col + dc
+        if not in_bounds(r, c):
+            continue
+        target = board.get_piece(r, c)
+        if target is None or target.color is not color:
+            if target is not None and target.kind is PieceType.KING:
                 continue
-            target = board.get_piece(r, c)
-            if target is None or target.color is not color:
-                if target is not None and target.kind is PieceType.KING:
-                    continue
-                moves.append(Move(row, col, r, c))
+            moves.append(Move(row, col, r, c))
     if is_in_check(board, color):
         return
     row_back = 7 if color is Color.WHITE else 0
     if row != row_back or col != 4:
         return
     rights = board.castling_rights[color]
+    enemy = color.opposite
     if rights["K"]:
         if (
             board.get_piece(row, 5) is None
             and board.get_piece(row, 6) is None
-            and not is_square_attacked(board, row, 5, color.opposite)
-            and not is_square_attacked(board, row, 6, color.opposite)
+            and not is_square_attacked(board, row, 5, enemy)
+            and not is_square_attacked(board, row, 6, enemy)
         ):
             moves.append(Move(row, col, row, 6, is_castling=True))
     if rights["Q"]:
@@ -335,55 +322,64 @@ def generate_king_moves(board: Board, row: int, col: int, moves: List[Move]) ->
             board.get_piece(row, 1) is None
             and board.get_piece(row, 2) is None
             and board.get_piece(row, 3) is None
-            and not is_square_attacked(board, row, 3, color.opposite)
-            and not is_square_attacked(board, row, 2, color.opposite)
+            and not is_square_attacked(board, row, 3, enemy)
+            and not is_square_attacked(board, row, 2, enemy)
         ):
             moves.append(Move(row, col, row, 2, is_castling=True))
 
 
 def generate_pseudo_legal_moves(board: Board, color: Color) -> List[Move]:
     moves: List[Move] = []
-    for row, col, piece in board.iter_squares():
-        if piece is None or piece.color is not color:
-            continue
-        if piece.kind is PieceType.PAWN:
-            generate_pawn_moves(board, row, col, moves)
-        elif piece.kind is PieceType.KNIGHT:
-            generate_knight_moves(board, row, col, moves)
-        elif piece.kind is PieceType.BISHOP:
-            generate_sliding_moves(
-                board,
-                row,
-                col,
-                [(-1, -1), (-1, 1), (1, -1), (1, 1)],
-                moves,
-            )
-        elif piece.kind is PieceType.ROOK:
-            generate_sliding_moves(
-                board,
-                row,
-                col,
-                [(-1, 0), (1, 0), (0, -1), (0, 1)],
-                moves,
-            )
-        elif piece.kind is PieceType.QUEEN:
-            generate_sliding_moves(
-                board,
-                row,
-                col,
-                [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)],
-                moves,
-            )
-        elif piece.kind is PieceType.KING:
-            generate_king_moves(board, row, col, moves)
+    # Walk only this side's occupied squares, one bitboard per piece kind
+    bitboards = board.bitboards[color]
+    for sq in iter_bits(bitboards[PieceType.PAWN]):
+        generate_pawn_moves(board, sq >> 3, sq & 7, moves)
+    for sq in iter_bits(bitboards[PieceType.KNIGHT]):
+        generate_knight_moves(board, sq >> 3, sq & 7, moves)
+    for sq in iter_bits(bitboards[PieceType.BISHOP]):
+        generate_sliding_moves(board, sq >> 3, sq & 7, BISHOP_DIRECTIONS, moves)
+    for sq in iter_bits(bitboards[PieceType.ROOK]):
+        generate_sliding_moves(board, sq >> 3, sq & 7, ROOK_DIRECTIONS, moves)
+    for sq in iter_bits(bitboards[PieceType.QUEEN]):
+        generate_sliding_moves(board, sq >> 3, sq & 7, QUEEN_DIRECTIONS, moves)
+    for sq in iter_bits(bitboards[PieceType.KING]):
+        generate_king_moves(board, sq >> 3, sq & 7, moves)
     return moves
 
 
-def make_move(board: Board, move: Move) -> Optional[Piece]:
+@dataclass
+class MoveUndo:
+    piece: Piece
+    piece_had_moved: bool
+    captured: Optional[Piece]
+    captured_square: Tuple[int, int]
+    rook: Optional[Piece]
+    rook_had_moved: bool
+    castling_rights: Tuple[bool, bool, bool, bool]
+    en_passant_target: Optional[Tuple[int, int]]
+    halfmove_clock: int
+    fullmove_number: int
+
+
+def make_move(board: Board, move: Move) -> Optional[MoveUndo]:
     piece = board.get_piece(move.from_row, move.from_col)
     captured = None
     if piece is None:
         return None
+    white_rights = board.castling_rights[Color.WHITE]
+    black_rights = board.castling_rights[Color.BLACK]
+    undo = MoveUndo(
+        piece=piece,
+        piece_had_moved=piece.has_moved,
+        captured=None,
+        captured_square=(move.to_row, move.to_col),
+        rook=None,
+        rook_had_moved=False,
+        castling_rights=(white_rights["K"], white_rights["Q"], black_rights["K"], black_rights["Q"]),
+        en_passant_target=board.en_passant_target,
+        halfmove_clock=board.halfmove_clock,
+        fullmove_number=board.fullmove_number,
+    )
     target = board.get_piece(move.to_row, move.to_col)
     if move.is_en_passant:
         direction = -1 if piece.color is Color.WHITE else 1
@@ -391,8 +387,10 @@ def make_move(board: Board, move: Move) -> Optional[Piece]:
         captured_col = move.to_col
         captured = board.get_piece(captured_row, captured_col)
         board.set_piece(captured_row, captured_col, None)
+        undo.captured_square = (captured_row, captured_col)
     else:
         captured = target
+    undo.captured = captured
     if move.is_castling and piece.kind is PieceType.KING:
         row = move.from_row
         if move.to_col == 6:
@@ -405,6 +403,8 @@ def make_move(board: Board, move: Move) -> Optional[Piece]:
         board.set_piece(row, rook_from_col, None)
         board.set_piece(row, rook_to_col, rook)
         if rook is not None:
+            undo.rook = rook
+            undo.rook_had_moved = rook.has_moved
             rook.has_moved = True
     board.set_piece(move.from_row, move.from_col, None)
     if move.promotion is not None and piece.kind is PieceType.PAWN:
@@ -446,7 +446,35 @@ def make_move(board: Board, move: Move) -> Optional[Piece]:
     if board.current_player is Color.BLACK:
         board.fullmove_number += 1
     board.current_player = board.current_player.opposite
-    return captured
+    return undo
+
+
+def unmake_move(board: Board, move: Move, undo: MoveUndo) -> None:
+    board.current_player = board.current_player.opposite
+    board.fullmove_number = undo.fullmove_number
+    board.halfmove_clock = undo.halfmove_clock
+    board.en_passant_target = undo.en_passant_target
+    white_k, white_q, black_k, black_q = undo.castling_rights
+    board.castling_rights[Color.WHITE]["K"] = white_k
+    board.castling_rights[Color.WHITE]["Q"] = white_q
+    board.castling_rights[Color.BLACK]["K"] = black_k
+    board.castling_rights[Color.BLACK]["Q"] = black_q
+    board.set_piece(move.to_row, move.to_col, None)
+    board.set_piece(move.from_row, move.from_col, undo.piece)
+    undo.piece.has_moved = undo.piece_had_moved
+    if undo.captured is not None:
+        board.set_piece(undo.captured_square[0], undo.captured_square[1], undo.captured)
+    if undo.rook is not None:
+        row = move.from_row
+        if move.to_col == 6:
+            rook_from_col = 7
+            rook_to_col = 5
+        else:
+            rook_from_col = 0
+            rook_to_col = 3
+        board.set_piece(row, rook_to_col, None)
+        board.set_piece(row, rook_from_col, undo.rook)
+        undo.rook.has_moved = undo.rook_had_moved
 
 
 def generate_legal_moves(board: Board, color: Optional[Color] = None) -> List[Move]:
@@ -454,41 +482,47 @@ def generate_legal_moves(board: Board, color: Optional[Color] = None) -> List[Mo
         color = board.current_player
     moves = generate_pseudo_legal_moves(board, color)
     legal: List[Move] = []
+    # Play each candidate on one scratch board and take it back again,
+    # rather than cloning the board per move. The caller's board is left
+    # untouched so other threads can keep reading it.
+    scratch = board.copy()
     for move in moves:
-        clone = board.copy()
-        make_move(clone, move)
-        if not is_in_check(clone, color):
+        undo = make_move(scratch, move)
+        if not is_in_check(scratch, color):
             legal.append(move)
+        if undo is not None:
+            unmake_move(scratch, move, undo)
     return legal
 
 
 def has_any_legal_moves(board: Board, color: Color) -> bool:
-    moves = generate_legal_moves(board, color)
-    return len(moves) > 0
+    scratch = board.copy()
+    for move in generate_pseudo_legal_moves(board, color):
+        undo = make_move(scratch, move)
+        in_check = is_in_check(scratch, color)
+        if undo is not None:
+            unmake_move(scratch, move, undo)
+        if not in_check:
+            return True
+    return False
 
 
 def material_balance(board: Board, color: Color) -> int:
+    own = board.bitboards[color]
+    other = board.bitboards[color.opposite]
     score = 0
-    for _, _, piece in board.iter_squares():
-        if piece is None:
-            continue
-        value = piece_values[piece.kind]
-        if piece.color is color:
-            score += value
-        else:
-            score -= value
+    for kind, value in piece_values.items():
+        score += value * (popcount(own[kind]) - popcount(other[kind]))
     return score
 
 
-from dataclasses import dataclass
-
 @dataclass
 class GameSnapshot:
     board: Board
     captured_white: List[Piece]
     captured_black: List[Piece]
     move_log: List[str]
-    repetition: Dict[str, int]
+    repetition: Dict[int, int]
     last_move: Optional[Move]
     result: Optional[str]
 
@@ -501,11 +535,21 @@ class Game:
         self.captured_white: List[Piece] = []
         self.captured_black: List[Piece] = []
         self.move_log: List[str] = []
-        self.repetition: Dict[str, int] = {}
+        self.repetition: Dict[int, int] = {}
         self.last_move: Optional[Move] = None
         self.result: Optional[str] = None
         self.draw_offered_by: Optional[Color] = None
         
+        # Legal moves for the position whose Zobrist key is _legal_key, plus by-source
+        # and by-(source, target) indexes; promotions share their route's entry
+        self._legal_key: Optional[int] = None
+        self._legal_moves: List[Move] = []
+        self._legal_by_src: Optional[Dict[Tuple[int, int], List[Move]]] = None
+        self._legal_by_route: Dict[Tuple[int, int, int, int], List[Move]] = {}
+        # (in check, has a legal move) for the side to move, keyed the same way
+        self._status_key: Optional[int] = None
+        self._status: Tuple[bool, bool] = (False, True)
+        
         self._update_repetition()
         
         # Initialize history with the starting state
@@ -525,30 +569,81 @@ class Game:
         self.history.append(snapshot)
 
     def _update_repetition(self) -> None:
-        key = self.board.board_key()
+        key = self.board.zobrist_key()
         self.repetition[key] = self.repetition.get(key, 0) + 1
 
     def get_legal_moves(self) -> List[Move]:
-        return generate_legal_moves(self.board, self.board.current_player)
+        # Cached per position; callers must not mutate the returned list
+        key = self.board.zobrist_key()
+        if key != self._legal_key:
+            self._legal_moves = generate_legal_moves(self.board, self.board.current_player)
+            self._legal_by_src = None
+            self._legal_key = key
+        return self._legal_moves
+
+    def _index_legal_moves(self) -> None:
+        legal_moves = self.get_legal_moves()
+        if self._legal_by_src is None:
+            by_src: Dict[Tuple[int, int], List[Move]] = {}
+            by_route: Dict[Tuple[int, int, int, int], List[Move]] = {}
+            for move in legal_moves:
+                by_src.setdefault((move.from_row, move.from_col), []).append(move)
+                by_route.setdefault(
+                    (move.from_row, move.from_col, move.to_row, move.to_col), []
+                ).append(move)
+            self._legal_by_src = by_src
+            self._legal_by_route = by_route
+
+    def legal_moves_from(self, row: int, col: int) -> List[Move]:
+        self._index_legal_moves()
+        return self._legal_by_src.get((row, col), [])
+
+    def legal_moves_between(self, from_row: int, from_col: int, to_row: int, to_col: int) -> List[Move]:
+        """Legal moves along one route: a single move, or the four promotion choices."""
+        self._index_legal_moves()
+        return self._legal_by_route.get((from_row, from_col, to_row, to_col), [])
+
+    def start_fen(self) -> str:
+        return self.history[0].board.to_fen()
+
+    def uci_moves(self) -> List[str]:
+        """Moves played since the start position, in UCI long algebraic notation."""
+        moves: List[str] = []
+        for snapshot in self.history[1:]:
+            move = snapshot.last_move
+            moves.append(format_move_san_like(
+                indices_to_square(move.from_row, move.from_col),
+                indices_to_square(move.to_row, move.to_col),
+                move.promotion,
+            ))
+        return moves
+
+    def _side_to_move_status(self) -> Tuple[bool, bool]:
+        key = self.board.zobrist_key()
+        if key != self._status_key:
+            color = self.board.current_player
+            self._status = (is_in_check(self.board, color), bool(self.get_legal_moves()))
+            self._status_key = key
+        return self._status
 
     def is_in_check(self, color: Optional[Color] = None) -> bool:
-        if color is None:
-            color = self.board.current_player
+        if color is None or color is self.board.current_player:
+            return self._side_to_move_status()[0]
         return is_in_check(self.board, color)
 
     def is_checkmate(self) -> bool:
-        color = self.board.current_player
-        return self.is_in_check(color) and not has_any_legal_moves(self.board, color)
+        in_check, has_moves = self._side_to_move_status()
+        return in_check and not has_moves
 
     def is_stalemate(self) -> bool:
-        color = self.board.current_player
-        return not self.is_in_check(color) and not has_any_legal_moves(self.board, color)
+        in_check, has_moves = self._side_to_move_status()
+        return not in_check and not has_moves
 
     def can_claim_fifty_move_draw(self) -> bool:
         return self.board.halfmove_clock >= 100
 
     def can_claim_threefold_draw(self) -> bool:
-        key = self.board.board_key()
+        key = self.board.zobrist_key()
         return self.repetition.get(key, 0) >= 3
 
     def apply_move(self, move: Move) -> bool:
@@ -558,9 +653,10 @@ class Game:
             return False
             
         # Generate algebraic notation before move is applied
-        notation = get_algebraic_notation(self.board, move)
+        notation = get_algebraic_notation(self.board, move, legal_moves)
         
-        captured = make_move(self.board, move)
+        undo = make_move(self.board, move)
+        captured = undo.captured if undo is not None else None
         if captured is not None:
             if captured.color is Color.WHITE:
                 self.captured_white.append(captured)
@@ -578,13 +674,15 @@ class Game:
         return True
 
     def update_result_after_move(self) -> None:
-        if self.is_checkmate():
-            winner = self.board.current_player.opposite
-            name = "White" if winner is Color.WHITE else "Black"
-            self.result = f"{name} wins by checkmate"
-            return
-        if self.is_stalemate():
-            self.result = "Draw by stalemate"
+        color = self.board.current_player
+        in_check, has_moves = self._side_to_move_status()
+        if not has_moves:
+            if in_check:
+                winner = color.opposite
+                name = "White" if winner is Color.WHITE else "Black"
+                self.result = f"{name} wins by checkmate"
+            else:
+                self.result = "Draw by stalemate"
             return
         if self.can_claim_fifty_move_draw():
             self.result = "Draw by fifty-move rule"
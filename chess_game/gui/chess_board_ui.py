@@ -1,8 +1,9 @@
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, List, Set
 from pathlib import Path
 import pygame
 from ..pieces import Piece
-from ..utils import Color, Move
+from ..utils import Color, Move, iter_bits
 from ..board import Board
 
 
@@ -17,11 +18,31 @@ HIGHLIGHT_LAST_MOVE = (205, 210, 106)
 HIGHLIGHT_INVALID = (220, 50, 50)
 LABEL_COLOR = (200, 200, 200)
 
+# SysFont scans the system font list on every call; share one Font per (name, size, bold)
+_FONTS: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+
+
+def get_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    key = (name, size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _FONTS[key] = font
+    return font
+
+
+@lru_cache(maxsize=512)
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    """Antialiased text, rendered once per (font, text, color); callers must not draw on the result."""
+    return font.render(text, True, color)
+
 
 class PieceImages:
     def __init__(self) -> None:
         self.images: Dict[str, pygame.Surface] = {}
         self.letters: Dict[str, pygame.Surface] = {}
+        # Scaled copies keyed by (piece key, mode, size), built on first use
+        self.thumbs: Dict[Tuple[str, str, int], pygame.Surface] = {}
         self.fallback_font: Optional[pygame.font.Font] = None
         self.mode: str = "images"
 
@@ -40,8 +61,9 @@ class PieceImages:
             "black_knight": ("black_knight.png", "n"),
             "black_pawn": ("black_pawn.png", "p"),
         }
+        self.thumbs.clear()
         try:
-            self.fallback_font = pygame.font.SysFont("arial", 40)
+            self.fallback_font = get_font("arial", 40)
         except Exception:
             self.fallback_font = None
         for key, (filename, symbol) in variants.items():
@@ -64,7 +86,8 @@ class PieceImages:
                 text_surface.blit(shadow, shadow_rect)
                 text_surface.blit(text, rect)
                 
-                self.letters[key] = text_surface
+                # Match the display's pixel format so board blits take the fast path
+                self.letters[key] = text_surface.convert_alpha()
             if path.is_file():
                 try:
                     image = pygame.image.load(str(path)).convert_alpha()
@@ -101,6 +124,17 @@ class PieceImages:
             return img
         return self.letters.get(key, img)
 
+    def get_thumb(self, piece: Piece, size: int) -> Optional[pygame.Surface]:
+        cache_key = (self.key_for_piece(piece), self.mode, size)
+        thumb = self.thumbs.get(cache_key)
+        if thumb is None:
+            image = self.get(piece)
+            if image is None:
+                return None
+            thumb = pygame.transform.smoothscale(image, (size, size))
+            self.thumbs[cache_key] = thumb
+        return thumb
+
 
 class BoardRenderer:
     def __init__(self, top_left: Tuple[int, int]) -> None:
@@ -109,6 +143,13 @@ class BoardRenderer:
         self.hover_square: Optional[Tuple[int, int]] = None
         self.invalid_flash_frames = 0
         self.orientation: Color = Color.WHITE
+        # Pre-rendered legal-target dot, built on first draw
+        self._move_dot: Optional[pygame.Surface] = None
+        # Screen rect of every square for each orientation, indexed by row * 8 + col
+        self._square_rects: Dict[Color, List[pygame.Rect]] = {
+            orientation: [self._layout_square(orientation, row, col) for row in range(8) for col in range(8)]
+            for orientation in (Color.WHITE, Color.BLACK)
+        }
         
         # Theme support
         self.themes = {
@@ -145,7 +186,11 @@ class BoardRenderer:
         return int(row), int(col)
 
     def square_to_rect(self, row: int, col: int) -> pygame.Rect:
-        if self.orientation == Color.BLACK:
+        # Shared rect; callers copy it before moving it
+        return self._square_rects[self.orientation][row * 8 + col]
+
+    def _layout_square(self, orientation: Color, row: int, col: int) -> pygame.Rect:
+        if orientation == Color.BLACK:
             draw_col = 7 - col
             draw_row = 7 - row
         else:
@@ -166,7 +211,7 @@ class BoardRenderer:
         surface: pygame.Surface,
         board: Board,
         selected: Optional[Tuple[int, int]],
-        moves_from_selected: Set[Tuple[int, int]],
+        moves_from_selected: int,
         last_move: Optional[Move],
         hint_move: Optional[Move],
         hide_pieces: Set[Tuple[int, int]],
@@ -202,11 +247,12 @@ class BoardRenderer:
         if selected is not None:
             rect = self.square_to_rect(*selected)
             pygame.draw.rect(surface, HIGHLIGHT_SELECTED, rect, 0)
-        for row, col in moves_from_selected:
-            rect = self.square_to_rect(row, col)
-            center_x, center_y = rect.center
-            radius = SQUARE_SIZE // 8
-            pygame.draw.circle(surface, HIGHLIGHT_MOVE, (center_x, center_y), radius)
+        if moves_from_selected:
+            dot = self._get_move_dot()
+            offset = SQUARE_SIZE // 2 - SQUARE_SIZE // 8
+            for square in iter_bits(moves_from_selected):
+                rect = self.square_to_rect(square >> 3, square & 7)
+                surface.blit(dot, (rect.x + offset, rect.y + offset))
         for row in range(8):
             for col in range(8):
                 if (row, col) in hide_pieces:
@@ -225,8 +271,16 @@ class BoardRenderer:
             pygame.draw.rect(surface, (200, 50, 50), rect, 3)
         self.draw_labels(surface)
 
+    def _get_move_dot(self) -> pygame.Surface:
+        if self._move_dot is None:
+            radius = SQUARE_SIZE // 8
+            dot = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(dot, HIGHLIGHT_MOVE, (radius, radius), radius)
+            self._move_dot = dot.convert_alpha()
+        return self._move_dot
+
     def draw_labels(self, surface: pygame.Surface) -> None:
-        font = pygame.font.SysFont("arial", 14)
+        font = get_font("arial", 14)
         files = "abcdefgh"
         if self.orientation == Color.BLACK:
             files = files[::-1]
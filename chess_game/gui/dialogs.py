@@ -1,4 +1,4 @@
-from typing import Optional, Callable, List, Tuple, Any
+from typing import Optional, Callable, List, Tuple, Any, Dict
 import pygame
 from chess_game.pieces import Piece, PieceType
 from chess_game.utils import Color
@@ -24,34 +24,34 @@ class PromotionDialog:
             "N": Piece(color, PieceType.KNIGHT)
         }
         self.option_rects: List[pygame.Rect] = []
+        # Option images scaled to fit their buttons, built once in layout()
+        self.scaled_images: Dict[str, Optional[pygame.Surface]] = {}
 
     def layout(self) -> None:
         self.option_rects.clear()
+        self.scaled_images.clear()
         width = self.rect.width // len(self.options)
-        for i, _ in enumerate(self.options):
+        for i, option in enumerate(self.options):
             x = self.rect.x + i * width
-            self.option_rects.append(pygame.Rect(x, self.rect.y, width, self.rect.height))
+            rect = pygame.Rect(x, self.rect.y, width, self.rect.height)
+            self.option_rects.append(rect)
+            
+            img = self.piece_images.get(self.option_pieces[option])
+            # piece_images.get returns a surface sized for the board; shrink it to fit the button
+            if img is not None and img.get_height() > rect.height - 10:
+                scale = (rect.height - 10) / img.get_height()
+                new_size = (int(img.get_width() * scale), int(img.get_height() * scale))
+                img = pygame.transform.smoothscale(img, new_size)
+            self.scaled_images[option] = img
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
         pygame.draw.rect(surface, (40, 40, 40), self.rect, border_radius=6)
         pygame.draw.rect(surface, (200, 200, 200), self.rect, 2, border_radius=6)
         
         for option, rect in zip(self.options, self.option_rects):
-            piece = self.option_pieces[option]
-            img = self.piece_images.get(piece)
+            img = self.scaled_images.get(option)
             
             if img:
-                # Scale if necessary (images are usually sized for board squares)
-                # Rect height is 60. Square size is likely bigger (75).
-                # piece_images.get returns a surface sized for the board.
-                # We might need to scale it down to fit the dialog button.
-                
-                # Check image size
-                if img.get_height() > rect.height - 10:
-                    scale = (rect.height - 10) / img.get_height()
-                    new_size = (int(img.get_width() * scale), int(img.get_height() * scale))
-                    img = pygame.transform.smoothscale(img, new_size)
-                    
                 img_rect = img.get_rect(center=rect.center)
                 surface.blit(img, img_rect)
             else:
@@ -72,8 +72,17 @@ class MessageOverlay:
         self.rect = rect
         self.text = ""
         self.frames_remaining = 0
+        # Translucent backing strip, filled once
+        self._bg = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+        self._bg.fill((0, 0, 0, 150))
+        # Rendered text, redone only when the text or font changes
+        self._text_surf: Optional[pygame.Surface] = None
+        self._text_rect: Optional[pygame.Rect] = None
+        self._text_font: Optional[pygame.font.Font] = None
 
     def show(self, text: str, frames: int = 180) -> None:
+        if text != self.text:
+            self._text_surf = None
         self.text = text
         self.frames_remaining = frames
 
@@ -81,14 +90,13 @@ class MessageOverlay:
         if self.frames_remaining <= 0 or not self.text:
             return
         self.frames_remaining -= 1
-        # Create a surface with alpha channel for transparency
-        s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 150))
-        surface.blit(s, self.rect)
+        surface.blit(self._bg, self.rect)
         
-        text = font.render(self.text, True, (255, 255, 255))
-        rect = text.get_rect(center=self.rect.center)
-        surface.blit(text, rect)
+        if self._text_surf is None or font is not self._text_font:
+            self._text_surf = font.render(self.text, True, (255, 255, 255))
+            self._text_rect = self._text_surf.get_rect(center=self.rect.center)
+            self._text_font = font
+        surface.blit(self._text_surf, self._text_rect)
 
 
 class WinningDialog:
@@ -116,19 +124,36 @@ class WinningDialog:
         self.menu_rect = pygame.Rect(start_x + w + spacing, y, w, h)
         self.hover_restart = False
         self.hover_menu = False
+        # The title and labels never change; render them once per font
+        self._text_cache: Dict[str, pygame.Surface] = {}
+        self._text_font: Optional[pygame.font.Font] = None
+        # Full-screen dim layer; built on first draw since the target size isn't known yet
+        self._overlay: Optional[pygame.Surface] = None
+
+    def _render(self, font: pygame.font.Font, text: str) -> pygame.Surface:
+        if font is not self._text_font:
+            self._text_cache.clear()
+            self._text_font = font
+        surf = self._text_cache.get(text)
+        if surf is None:
+            surf = font.render(text, True, (255, 255, 255))
+            self._text_cache[text] = surf
+        return surf
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
         # Overlay background (full screen dim)
-        overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        surface.blit(overlay, (0, 0))
+        size = surface.get_size()
+        if self._overlay is None or self._overlay.get_size() != size:
+            self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+            self._overlay.fill((0, 0, 0, 180))
+        surface.blit(self._overlay, (0, 0))
         
         # Dialog box
         pygame.draw.rect(surface, (50, 50, 50), self.rect, border_radius=12)
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 2, border_radius=12)
         
         # Title
-        title_surf = font.render(self.title, True, (255, 255, 255))
+        title_surf = self._render(font, self.title)
         title_rect = title_surf.get_rect(center=(self.rect.centerx, self.rect.y + 40))
         surface.blit(title_surf, title_rect)
         
@@ -142,7 +167,7 @@ class WinningDialog:
     def _draw_button(self, surface, font, rect, text, color):
         pygame.draw.rect(surface, color, rect, border_radius=8)
         pygame.draw.rect(surface, (255, 255, 255), rect, 1, border_radius=8)
-        txt = font.render(text, True, (255, 255, 255))
+        txt = self._render(font, text)
         txt_rect = txt.get_rect(center=rect.center)
         surface.blit(txt, txt_rect)
 
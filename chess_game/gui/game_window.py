@@ -3,15 +3,15 @@ from pathlib import Path
 import pygame
 import random
 import threading
-import queue
 import os
 import math
-from ..game_logic import Game
+from concurrent.futures import ThreadPoolExecutor
+from ..game_logic import Game, locate_king
 from ..engine.lc0_engine import LC0Engine
 from ..utils import Color, Move, indices_to_square, square_to_indices, PieceType
 from ..pieces import Piece
-from .chess_board_ui import BoardRenderer, BOARD_SIZE, SQUARE_SIZE
-from .menu_handler import ButtonBar, Button
+from .chess_board_ui import BoardRenderer, BOARD_SIZE, SQUARE_SIZE, get_font, render_text
+from .menu_handler import ButtonBar, Button, buttons_bbox, hover_buttons
 from .dialogs import PromotionDialog, MessageOverlay, WinningDialog
 
 
@@ -20,6 +20,13 @@ WINDOW_HEIGHT = 720
 PANEL_BG = (30, 30, 30)
 TEXT_COLOR = (230, 230, 230)
 
+# Move animation length and its smoothstep curve, one entry per elapsed millisecond
+MOVE_ANIMATION_MS = 250
+_EASE_BY_MS = [
+    (ms / MOVE_ANIMATION_MS) ** 2 * (3 - 2 * ms / MOVE_ANIMATION_MS)
+    for ms in range(MOVE_ANIMATION_MS + 1)
+]
+
 # Turn States
 TURN_PLAYER = "player"
 TURN_AI = "ai"
@@ -29,10 +36,24 @@ USEREVENT_AI_MOVE = pygame.USEREVENT + 1
 USEREVENT_HINT_READY = pygame.USEREVENT + 2
 
 class InteractionState:
+    __slots__ = (
+        "selected",
+        "moves_from_selected",
+        "pending_promotion_map",
+        "hint_move",
+        "awaiting_promotion",
+        "dragging",
+        "drag_start_pos",
+        "drag_offset",
+        "drag_piece",
+    )
+
     def __init__(self) -> None:
         self.selected: Optional[Tuple[int, int]] = None
-        self.moves_from_selected: Set[Tuple[int, int]] = set()
-        self.pending_promotion_moves: List[Move] = []
+        # Target squares as a bitboard mask, bit index = row * 8 + col
+        self.moves_from_selected: int = 0
+        # Promotion moves for the chosen route, keyed by the promotion letter
+        self.pending_promotion_map: Dict[str, Move] = {}
         self.hint_move: Optional[Move] = None
         self.awaiting_promotion = False
         self.dragging = False
@@ -41,6 +62,12 @@ class InteractionState:
         self.drag_piece: Optional[Piece] = None
 
 
+def _glide(
+    image: pygame.Surface, start: Tuple[float, float], end: Tuple[float, float]
+) -> Tuple[pygame.Surface, Tuple[float, float], Tuple[float, float], pygame.Rect]:
+    return image, start, (end[0] - start[0], end[1] - start[1]), image.get_rect(center=start)
+
+
 class MoveAnimation:
     def __init__(
         self,
@@ -51,9 +78,14 @@ class MoveAnimation:
         self.renderer = renderer
         self.move = move
         self.start_time = pygame.time.get_ticks()
-        self.duration = 250
-        self.pieces: List[Tuple[pygame.Surface, Tuple[float, float], Tuple[float, float]]] = []
-        self.captured_overlays: List[Tuple[pygame.Surface, Tuple[float, float]]] = []
+        self.duration = MOVE_ANIMATION_MS
+        # Eased progress as of the last progress() call; sampled once per frame
+        self.current_t = 0.0
+        # (image, start center, end - start, rect); a frame's center is start + delta * t,
+        # written into the piece's own rect rather than a new one each frame
+        self.pieces: List[Tuple[pygame.Surface, Tuple[float, float], Tuple[float, float], pygame.Rect]] = []
+        # (fading image, fixed rect)
+        self.captured_overlays: List[Tuple[pygame.Surface, pygame.Rect]] = []
         piece = board.board.get_piece(move.from_row, move.from_col)
         if piece is None:
             return
@@ -61,7 +93,7 @@ class MoveAnimation:
         rect_to = renderer.square_to_rect(move.to_row, move.to_col)
         image = renderer.piece_images.get(piece)
         if image is not None:
-            self.pieces.append((image, rect_from.center, rect_to.center))
+            self.pieces.append(_glide(image, rect_from.center, rect_to.center))
         captured = None
         if move.is_en_passant:
             direction = -1 if piece.color is Color.WHITE else 1
@@ -71,14 +103,18 @@ class MoveAnimation:
                 rect_cap = renderer.square_to_rect(captured_row, move.to_col)
                 img_cap = renderer.piece_images.get(captured)
                 if img_cap is not None:
-                    self.captured_overlays.append((img_cap, rect_cap.center))
+                    # Private copy so the fade can set its alpha in place each frame
+                    fade = img_cap.copy()
+                    self.captured_overlays.append((fade, fade.get_rect(center=rect_cap.center)))
         else:
             captured = board.board.get_piece(move.to_row, move.to_col)
             if captured is not None:
                 rect_cap = renderer.square_to_rect(move.to_row, move.to_col)
                 img_cap = renderer.piece_images.get(captured)
                 if img_cap is not None:
-                    self.captured_overlays.append((img_cap, rect_cap.center))
+                    # Private copy so the fade can set its alpha in place each frame
+                    fade = img_cap.copy()
+                    self.captured_overlays.append((fade, fade.get_rect(center=rect_cap.center)))
         if move.is_castling and piece.kind is PieceType.KING:
             row = move.from_row
             if move.to_col == 6:
@@ -93,19 +129,21 @@ class MoveAnimation:
                 rect_r_to = renderer.square_to_rect(row, rook_to_col)
                 img_rook = renderer.piece_images.get(rook)
                 if img_rook is not None:
-                    self.pieces.append((img_rook, rect_r_from.center, rect_r_to.center))
+                    self.pieces.append(_glide(img_rook, rect_r_from.center, rect_r_to.center))
 
     def progress(self) -> float:
         elapsed = pygame.time.get_ticks() - self.start_time
         if elapsed <= 0:
-            return 0.0
-        if elapsed >= self.duration:
-            return 1.0
-        t = elapsed / self.duration
-        return t * t * (3 - 2 * t)
+            t = 0.0
+        elif elapsed >= self.duration:
+            t = 1.0
+        else:
+            t = _EASE_BY_MS[elapsed]
+        self.current_t = t
+        return t
 
     def is_done(self) -> bool:
-        return self.progress() >= 1.0
+        return self.current_t >= 1.0
 
 class GameWindow:
     AI_LEVELS = {
@@ -126,10 +164,30 @@ class GameWindow:
         self.running = True
         self.game = Game()
         self.board_renderer = BoardRenderer((40, (WINDOW_HEIGHT - BOARD_SIZE) // 2))
-        self.side_font = pygame.font.SysFont("arial", 18)
-        self.title_font = pygame.font.SysFont("arial", 48, bold=True)
-        self.small_font = pygame.font.SysFont("arial", 14)
-        self.button_font = pygame.font.SysFont("arial", 16)
+        self.side_font = get_font("arial", 18)
+        self.title_font = get_font("arial", 48, bold=True)
+        self.small_font = get_font("arial", 14)
+        self.button_font = get_font("arial", 16)
+        self.title_cache: Dict[str, pygame.Surface] = {}
+        self.move_line_cache: Dict[str, pygame.Surface] = {}
+        self.move_log_surfaces: List[pygame.Surface] = []
+        self.move_log_key: Optional[Tuple[int, int]] = None
+        # Side panel raster and the state it was drawn from
+        self.panel_surface: Optional[pygame.Surface] = None
+        self.panel_key: Optional[Tuple] = None
+        # Fixed layout rects, built once rather than per frame/click
+        panel_x = BOARD_SIZE + 80
+        self.side_panel_rect = pygame.Rect(
+            panel_x, (WINDOW_HEIGHT - BOARD_SIZE) // 2, WINDOW_WIDTH - panel_x - 40, BOARD_SIZE
+        )
+        self.promotion_rect = pygame.Rect(80, WINDOW_HEIGHT // 2 - 30, WINDOW_WIDTH - 160, 60)
+        # Translucent black over the playing screen's fill, composited once
+        self.panel_backdrop = pygame.Surface((self.side_panel_rect.width, self.side_panel_rect.height))
+        self.panel_backdrop.fill((20, 20, 20))
+        shade = pygame.Surface((self.side_panel_rect.width, self.side_panel_rect.height))
+        shade.set_alpha(200)
+        shade.fill((0, 0, 0))
+        self.panel_backdrop.blit(shade, (0, 0))
         self.interaction = InteractionState()
         self.message_overlay = MessageOverlay(
             pygame.Rect(0, WINDOW_HEIGHT - 40, WINDOW_WIDTH, 30),
@@ -148,22 +206,10 @@ class GameWindow:
         except Exception:
             pass
             
+        # Decoded in the background; play_sound skips any not loaded yet
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
         if self.sounds_dir.exists():
-            sound_files = {
-                "move-self": "move-self.mp3",
-                "move-check": "move-check.mp3",
-                "capture": "capture.mp3",
-                "castle": "castle.mp3",
-                "promote": "promote.mp3"
-            }
-            for key, filename in sound_files.items():
-                path = self.sounds_dir / filename
-                if path.exists():
-                    try:
-                        self.sounds[key] = pygame.mixer.Sound(str(path))
-                    except Exception:
-                        pass
+            threading.Thread(target=self._load_sounds, daemon=True).start()
 
         # Load Logo
         self.logo_image = None
@@ -188,6 +234,15 @@ class GameWindow:
         if "classic" not in self.available_piece_sets:
             self.available_piece_sets.append("classic")
         self.current_piece_set = "classic"
+        # Settings-tab knight icons, decoded once per set; PNG decoding overlaps across
+        # worker threads, conversion to the display format stays on this thread
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            raw_icons = list(pool.map(self._read_piece_set_icon, self.available_piece_sets))
+        self.piece_set_icons: Dict[str, Optional[pygame.Surface]] = {
+            set_name: self._scale_piece_set_icon(raw)
+            for set_name, raw in zip(self.available_piece_sets, raw_icons)
+        }
+        self.letter_icon = self._build_letter_icon()
 
         # Initialize Pieces
         self.board_renderer.piece_images.load(self.pieces_dir / self.current_piece_set)
@@ -201,6 +256,8 @@ class GameWindow:
                     self.available_backgrounds.append(item)
         
         self.background_surface = None
+        # Window-sized backgrounds, scaled once per file
+        self.background_cache: Dict[Path, pygame.Surface] = {}
         classic_bg = None
         for bg in self.available_backgrounds:
             if "classic" in bg.name.lower():
@@ -236,7 +293,6 @@ class GameWindow:
         self.ai_level_names = [f"Level {i+1}" for i in range(7)]
         self.ai_level_index = 3 # Default to Level 4 (Intermediate)
         self.ai_thread: Optional[threading.Thread] = None
-        self.ai_move_queue: queue.Queue = queue.Queue()
         self.promotion_dialog: Optional[PromotionDialog] = None
         self.winning_dialog: Optional[WinningDialog] = None
         self.current_animation: Optional[MoveAnimation] = None
@@ -251,6 +307,11 @@ class GameWindow:
 
         self.turn_state = TURN_PLAYER
         self.ai_move_scheduled = False
+        
+        # Redraw gating: set by input, cleared once a frame is drawn
+        self.dirty = True
+        self._was_animating = False
+        self._drawn_clock: Optional[Tuple[int, int]] = None
 
         # Time Control Settings
         self.time_control = None  # None means "No Clock"
@@ -277,6 +338,13 @@ class GameWindow:
         self.engine: Optional[LC0Engine] = None
         self.ai_movetime = 100 # default Medium
 
+    def render_title(self, text: str) -> pygame.Surface:
+        title = self.title_cache.get(text)
+        if title is None:
+            title = self.title_font.render(text, True, (255, 255, 255))
+            self.title_cache[text] = title
+        return title
+
     def ensure_engine(self):
         if self.engine is None:
             try:
@@ -286,16 +354,18 @@ class GameWindow:
                 self.message_overlay.show("Error: LC0 Engine failed!", frames=200)
 
     def _create_background(self) -> pygame.Surface:
-        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
         top_color = (40, 44, 52)
         bottom_color = (20, 20, 20)
+        # Build a one-pixel-wide column of RGB rows, then stretch it sideways in one call
+        column = bytearray()
         for y in range(WINDOW_HEIGHT):
             ratio = y / WINDOW_HEIGHT
-            r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-            g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-            b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
-            pygame.draw.line(surface, (r, g, b), (0, y), (WINDOW_WIDTH, y))
-        return surface
+            column += bytes(
+                int(top * (1 - ratio) + bottom * ratio)
+                for top, bottom in zip(top_color, bottom_color)
+            )
+        strip = pygame.image.frombuffer(bytes(column), (1, WINDOW_HEIGHT), "RGB")
+        return pygame.transform.scale(strip, (WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
 
     def create_menus(self) -> None:
         center_x = WINDOW_WIDTH // 2
@@ -326,24 +396,75 @@ class GameWindow:
             else:
                 cb = lambda lvl=label: self.menu_start_single_with_level(lvl)
             self.difficulty_buttons.append(Button(rect, label, cb))
+        
+        # Vertical stacks: one box test rejects the pointer for the whole group
+        self.menu_bbox = buttons_bbox(self.menu_buttons)
+        self.difficulty_bbox = buttons_bbox(self.difficulty_buttons)
 
     def create_settings_buttons(self) -> None:
         pass
 
+    def _build_letter_icon(self) -> pygame.Surface:
+        letter_icon = pygame.Surface((32, 32), pygame.SRCALPHA)
+        k_text = get_font("serif", 28, bold=True).render("K", True, (255, 255, 255))
+        if k_text:
+            letter_icon.blit(k_text, k_text.get_rect(center=(16, 16)))
+        return letter_icon
+
+    def _read_piece_set_icon(self, set_name: str) -> Optional[pygame.Surface]:
+        try:
+            icon_path = self.pieces_dir / set_name / "white_knight.png"
+            if icon_path.exists():
+                return pygame.image.load(str(icon_path))
+        except Exception:
+            pass
+        return None
+
+    def _scale_piece_set_icon(self, icon: Optional[pygame.Surface]) -> Optional[pygame.Surface]:
+        if icon is None:
+            return None
+        try:
+            return pygame.transform.smoothscale(icon.convert_alpha(), (32, 32))
+        except Exception:
+            return None
+
     def load_background(self, path: Path) -> None:
+        cached = self.background_cache.get(path)
+        if cached is not None:
+            self.background_surface = cached
+            self.current_bg_path = path
+            return
         try:
             img = pygame.image.load(str(path)).convert()
             self.background_surface = pygame.transform.smoothscale(img, (WINDOW_WIDTH, WINDOW_HEIGHT))
+            self.background_cache[path] = self.background_surface
             self.current_bg_path = path
         except Exception:
             pass
 
+    def _load_sounds(self) -> None:
+        sound_files = {
+            "move-self": "move-self.mp3",
+            "move-check": "move-check.mp3",
+            "capture": "capture.mp3",
+            "castle": "castle.mp3",
+            "promote": "promote.mp3"
+        }
+        for key, filename in sound_files.items():
+            path = self.sounds_dir / filename
+            if path.exists():
+                try:
+                    self.sounds[key] = pygame.mixer.Sound(str(path))
+                except Exception:
+                    pass
+
     def play_sound(self, sound_name: str) -> None:
         if not self.settings["sound_move"]:
             return
-        if sound_name in self.sounds:
+        sound = self.sounds.get(sound_name)
+        if sound is not None:
             try:
-                self.sounds[sound_name].play()
+                sound.play()
             except Exception:
                 pass
                 
@@ -351,7 +472,7 @@ class GameWindow:
         self.current_piece_set = name
         self.board_renderer.piece_images.images.clear()
         self.board_renderer.piece_images.load(self.pieces_dir / name)
-        self.update_settings_buttons()
+        self.refresh_settings_buttons()
 
     def update_settings_buttons(self) -> None:
         self.settings_buttons = []
@@ -375,33 +496,20 @@ class GameWindow:
         
         if self.settings_tab == "Pieces":
             mode = self.board_renderer.piece_images.mode
-            letter_icon = pygame.Surface((32, 32), pygame.SRCALPHA)
-            k_font = pygame.font.SysFont("serif", 28, bold=True)
-            k_text = k_font.render("K", True, (255, 255, 255))
-            if k_text:
-                letter_icon.blit(k_text, k_text.get_rect(center=(16, 16)))
-                
             btn_h = 50
             self.settings_buttons.append(Button(
                 pygame.Rect(content_x, content_y, 200, btn_h), 
                 "Letters", 
                 lambda: self.set_piece_mode("letters"), 
                 selected=(mode=="letters"),
-                icon=letter_icon
+                icon=self.letter_icon,
+                key="piece_mode:letters"
             ))
             
             current_y = content_y + btn_h + 10
             
             for set_name in self.available_piece_sets:
-                icon = None
-                try:
-                    icon_path = self.pieces_dir / set_name / "white_knight.png"
-                    if icon_path.exists():
-                        icon = pygame.image.load(str(icon_path)).convert_alpha()
-                        icon = pygame.transform.smoothscale(icon, (32, 32))
-                except:
-                    pass
-                
+                icon = self.piece_set_icons.get(set_name)
                 is_selected = (mode == "images" and self.current_piece_set == set_name)
                 
                 self.settings_buttons.append(Button(
@@ -409,7 +517,8 @@ class GameWindow:
                     set_name.replace("-", " ").title(),
                     lambda n=set_name: [self.set_piece_set_name(n), self.set_piece_mode("images")],
                     selected=is_selected,
-                    icon=icon
+                    icon=icon,
+                    key=f"piece_set:{set_name}"
                 ))
                 current_y += btn_h + 10
                 
@@ -426,7 +535,7 @@ class GameWindow:
                 x = content_x
                 y = content_y + i * (btn_h + spacing)
                 rect = pygame.Rect(x, y, btn_w, btn_h)
-                self.settings_buttons.append(Button(rect, name, lambda n=name: self.set_theme_mode(n), selected=(curr_theme==name)))
+                self.settings_buttons.append(Button(rect, name, lambda n=name: self.set_theme_mode(n), selected=(curr_theme==name), key=f"theme:{name}"))
 
         elif self.settings_tab == "Background":
             btn_w = 200
@@ -435,15 +544,44 @@ class GameWindow:
                 name = bg_path.stem.replace("_", " ").title()
                 is_selected = (hasattr(self, 'current_bg_path') and self.current_bg_path == bg_path)
                 rect = pygame.Rect(content_x, content_y + i * (btn_h + 10), btn_w, btn_h)
-                self.settings_buttons.append(Button(rect, name, lambda p=bg_path: self.load_background(p), selected=is_selected))
+                self.settings_buttons.append(Button(
+                    rect,
+                    name,
+                    lambda p=bg_path: [self.load_background(p), self.refresh_settings_buttons()],
+                    selected=is_selected,
+                    key=f"background:{bg_path}"
+                ))
                 
         elif self.settings_tab == "Game":
             snd = self.settings["sound_move"]
             self.settings_buttons.append(Button(pygame.Rect(content_x, content_y, 140, 40), "Sound: " + ("On" if snd else "Off"), 
-                self.toggle_sound))
+                self.toggle_sound, key="sound"))
             chk = self.settings["highlight_check"]
             self.settings_buttons.append(Button(pygame.Rect(content_x, content_y + 60, 200, 40), "Show Check: " + ("Yes" if chk else "No"), 
-                lambda: self.set_highlight_check(not chk)))
+                lambda: self.set_highlight_check(not self.settings["highlight_check"]), key="highlight_check"))
+
+    def refresh_settings_buttons(self) -> None:
+        """Syncs selection flags and toggle labels in place; only a tab switch rebuilds the buttons."""
+        mode = self.board_renderer.piece_images.mode
+        curr_theme = self.settings["theme"]
+        if curr_theme == "Classic": curr_theme = "Brown"
+        curr_bg = str(getattr(self, 'current_bg_path', ""))
+        for button in self.settings_buttons:
+            if button.key is None:
+                continue
+            kind, _, value = button.key.partition(":")
+            if kind == "piece_mode":
+                button.selected = (mode == value)
+            elif kind == "piece_set":
+                button.selected = (mode == "images" and self.current_piece_set == value)
+            elif kind == "theme":
+                button.selected = (curr_theme == value)
+            elif kind == "background":
+                button.selected = (curr_bg == value)
+            elif kind == "sound":
+                button.label = "Sound: " + ("On" if self.settings["sound_move"] else "Off")
+            elif kind == "highlight_check":
+                button.label = "Show Check: " + ("Yes" if self.settings["highlight_check"] else "No")
 
     def set_settings_tab(self, tab: str) -> None:
         self.settings_tab = tab
@@ -451,24 +589,24 @@ class GameWindow:
 
     def set_highlight_check(self, enabled: bool) -> None:
         self.settings["highlight_check"] = enabled
-        self.update_settings_buttons()
+        self.refresh_settings_buttons()
 
     def set_piece_mode(self, mode: str) -> None:
         if mode == "images":
             self.board_renderer.piece_images.set_mode_images()
         else:
             self.board_renderer.piece_images.set_mode_letters()
-        self.update_settings_buttons()
+        self.refresh_settings_buttons()
 
     def set_theme_mode(self, theme: str) -> None:
         self.settings["theme"] = theme
         self.board_renderer.set_theme(theme)
-        self.update_settings_buttons()
+        self.refresh_settings_buttons()
 
     def set_sound_mode(self, enabled: bool) -> None:
         self.settings["sound_move"] = enabled
         self.settings["sound_capture"] = enabled
-        self.update_settings_buttons()
+        self.refresh_settings_buttons()
 
     def create_color_buttons(self) -> None:
         center_x = WINDOW_WIDTH // 2
@@ -559,6 +697,10 @@ class GameWindow:
         self.pending_move = None
         self.message_overlay.show("New game started", frames=120)
         
+        if self.engine:
+            # ucinewgame keeps the loaded network; run off the UI thread in case a search is in flight
+            threading.Thread(target=self.engine.soft_reset, daemon=True).start()
+        
         if self.time_control:
             self.white_time = float(self.time_control[0])
             self.black_time = float(self.time_control[0])
@@ -619,7 +761,7 @@ class GameWindow:
             self.board_renderer.piece_images.set_mode_images()
             self.message_overlay.show("Piece style: Images", frames=60)
         if self.state == "settings":
-            self.update_settings_buttons()
+            self.refresh_settings_buttons()
 
     def cycle_theme(self) -> None:
         themes = list(self.board_renderer.themes.keys())
@@ -633,13 +775,13 @@ class GameWindow:
         self.settings["theme"] = new_theme
         self.board_renderer.set_theme(new_theme)
         if self.state == "settings":
-            self.update_settings_buttons()
+            self.refresh_settings_buttons()
             
     def toggle_sound(self) -> None:
         self.settings["sound_move"] = not self.settings["sound_move"]
         self.settings["sound_capture"] = self.settings["sound_move"]
         if self.state == "settings":
-            self.update_settings_buttons()
+            self.refresh_settings_buttons()
 
     def restart_game(self) -> None:
         self.new_game()
@@ -683,11 +825,8 @@ class GameWindow:
         if success:
             self.interaction = InteractionState()
             self.message_overlay.show("Move undone", frames=120)
-            while not self.ai_move_queue.empty():
-                try:
-                    self.ai_move_queue.get_nowait()
-                except queue.Empty:
-                    pass
+            # Drop an engine reply posted before the undo but not yet handled
+            pygame.event.clear(USEREVENT_AI_MOVE)
         else:
             self.message_overlay.show("No moves to undo", frames=120)
 
@@ -702,13 +841,16 @@ class GameWindow:
 
         self.message_overlay.show("Thinking...", frames=60)
         
-        fen = self.game.board.to_fen()
+        fen = self.game.start_fen()
+        uci_moves = self.game.uci_moves()
+        # The engine may finish an AI search first; the handler drops hints for a stale position
+        position_key = self.game.board.zobrist_key()
         # User requested 50ms for hints
         movetime = 50 
         
         threading.Thread(
             target=self.run_lc0_hint,
-            args=(fen, movetime),
+            args=(fen, movetime, uci_moves, position_key),
             daemon=True
         ).start()
 
@@ -724,12 +866,11 @@ class GameWindow:
         end = indices_to_square(move.to_row, move.to_col)
         return start + " " + end
 
-    def compute_moves_from(self, row: int, col: int) -> Set[Tuple[int, int]]:
-        result: Set[Tuple[int, int]] = set()
-        for move in self.game.get_legal_moves():
-            if move.from_row == row and move.from_col == col:
-                result.add((move.to_row, move.to_col))
-        return result
+    def compute_moves_from(self, row: int, col: int) -> int:
+        mask = 0
+        for move in self.game.legal_moves_from(row, col):
+            mask |= 1 << (move.to_row * 8 + move.to_col)
+        return mask
 
     def handle_board_click(self, pos: Tuple[int, int], animate: bool = True) -> None:
         if self.game.result:
@@ -747,7 +888,7 @@ class GameWindow:
         square = self.board_renderer.pixel_to_square(*pos)
         if square is None:
             self.interaction.selected = None
-            self.interaction.moves_from_selected.clear()
+            self.interaction.moves_from_selected = 0
             return
         row, col = square
         board = self.game.board
@@ -763,30 +904,17 @@ class GameWindow:
 
         if self.interaction.selected is not None:
             targets = self.interaction.moves_from_selected
-            if (row, col) in targets:
-                moves = [
-                    m
-                    for m in self.game.get_legal_moves()
-                    if m.from_row == self.interaction.selected[0]
-                    and m.from_col == self.interaction.selected[1]
-                    and m.to_row == row
-                    and m.to_col == col
-                ]
+            if targets >> (row * 8 + col) & 1:
+                moves = self.game.legal_moves_between(*self.interaction.selected, row, col)
                 if not moves:
                     self.board_renderer.trigger_invalid_flash()
                     return
-                promotion_moves = [m for m in moves if m.promotion is not None]
-                if promotion_moves:
-                    self.interaction.pending_promotion_moves = promotion_moves
+                # A route holds either one plain move or only promotion moves
+                if moves[0].promotion is not None:
+                    self.interaction.pending_promotion_map = {m.promotion.value: m for m in moves}
                     self.interaction.awaiting_promotion = True
-                    rect = pygame.Rect(
-                        80,
-                        WINDOW_HEIGHT // 2 - 30,
-                        WINDOW_WIDTH - 160,
-                        60,
-                    )
                     dialog = PromotionDialog(
-                        rect, 
+                        self.promotion_rect,
                         self.handle_promotion_choice,
                         self.board_renderer.piece_images,
                         self.game.board.current_player
@@ -797,32 +925,27 @@ class GameWindow:
                 move = moves[0]
                 self.apply_move_and_schedule_ai(move, animate=animate)
                 self.interaction.selected = None
-                self.interaction.moves_from_selected.clear()
+                self.interaction.moves_from_selected = 0
                 return
             
             self.interaction.selected = None
-            self.interaction.moves_from_selected.clear()
+            self.interaction.moves_from_selected = 0
             return
         pass
 
     def handle_promotion_choice(self, choice: str) -> None:
-        moves = [
-            m
-            for m in self.interaction.pending_promotion_moves
-            if m.promotion is not None and m.promotion.value == choice
-        ]
-        if not moves:
+        move = self.interaction.pending_promotion_map.get(choice)
+        if move is None:
             self.interaction.awaiting_promotion = False
             self.promotion_dialog = None
-            self.interaction.pending_promotion_moves = []
+            self.interaction.pending_promotion_map = {}
             return
-        move = moves[0]
         self.apply_move_and_schedule_ai(move)
         self.interaction.awaiting_promotion = False
         self.promotion_dialog = None
-        self.interaction.pending_promotion_moves = []
+        self.interaction.pending_promotion_map = {}
         self.interaction.selected = None
-        self.interaction.moves_from_selected.clear()
+        self.interaction.moves_from_selected = 0
 
     def apply_move_with_sound(self, move: Move) -> None:
         is_capture = False
@@ -881,26 +1004,26 @@ class GameWindow:
             else:
                 self.turn_state = TURN_PLAYER
 
-    def run_lc0_hint(self, fen: str, movetime: int) -> None:
+    def run_lc0_hint(self, fen: str, movetime: int, uci_moves: List[str], position_key: int) -> None:
         try:
             if not self.engine:
                 return
-            best_move_str = self.engine.get_best_move(fen, {'movetime': movetime})
+            best_move_str = self.engine.get_best_move(fen, {'movetime': movetime}, uci_moves)
             if best_move_str:
                 move = self._parse_engine_move(best_move_str)
                 if move:
-                    pygame.event.post(pygame.event.Event(USEREVENT_HINT_READY, move=move))
+                    pygame.event.post(pygame.event.Event(USEREVENT_HINT_READY, move=move, position_key=position_key))
         except Exception as e:
             print(f"LC0 Hint Error: {e}")
 
-    def run_lc0_search(self, fen: str, limits: Dict, legal_moves: List[Move]) -> None:
+    def run_lc0_search(self, fen: str, limits: Dict, legal_moves: List[Move], uci_moves: List[str]) -> None:
         try:
             # Check for engine
             if not self.engine:
                 print("LC0 Engine not initialized")
                 return
 
-            best_move_str = self.engine.get_best_move(fen, limits)
+            best_move_str = self.engine.get_best_move(fen, limits, uci_moves)
             if best_move_str:
                 move = self._parse_engine_move(best_move_str)
                 if move:
@@ -909,8 +1032,8 @@ class GameWindow:
                     print(f"Failed to parse move: {best_move_str}")
             else:
                 print("Engine returned no move (timeout/crash?)")
-                # Attempt restart for next time
-                self.engine.restart()
+                # Reset for next time; escalates to a full restart if unresponsive
+                self.engine.soft_reset()
                 # Fallback: Play random legal move to prevent freeze
                 if legal_moves:
                     move = random.choice(legal_moves)
@@ -920,7 +1043,7 @@ class GameWindow:
             print(f"LC0 Error: {e}")
             try:
                 if self.engine:
-                    self.engine.restart()
+                    self.engine.hard_restart()
             except:
                 pass
             
@@ -990,13 +1113,14 @@ class GameWindow:
         # Show "AI thinking..."
         self.message_overlay.show("AI thinking...", frames=300)
         
-        fen = self.game.board.to_fen()
+        fen = self.game.start_fen()
+        uci_moves = self.game.uci_moves()
         limits = self.AI_LEVELS.get(self.ai_level_index, self.AI_LEVELS[3])
         legal_moves = self.game.get_legal_moves()
         
         self.ai_thread = threading.Thread(
             target=self.run_lc0_search,
-            args=(fen, limits, legal_moves)
+            args=(fen, limits, legal_moves, uci_moves)
         )
         self.ai_thread.daemon = True
         self.ai_thread.start()
@@ -1004,12 +1128,15 @@ class GameWindow:
     def update_game_logic(self) -> None:
         # 1. Handle Animation Completion
         if self.current_animation is not None:
+            # Sample the clock once per frame; is_done() and draw() reuse current_t
+            self.current_animation.progress()
             if self.current_animation.is_done():
                 move = self.current_animation.move
                 self.current_animation = None
                 
                 # Apply the move permanently
                 self.apply_move_with_sound(move)
+                self.dirty = True
                 
                 # Check pending state for AI trigger
                 if self.pending_move:
@@ -1045,6 +1172,7 @@ class GameWindow:
                     if self.white_time <= 0:
                         self.white_time = 0
                         self.game.result = "Black wins on time"
+                        self.dirty = True
                         self.winning_dialog = WinningDialog(
                             pygame.Rect(WINDOW_WIDTH//2 - 150, WINDOW_HEIGHT//2 - 100, 300, 200),
                             "Black wins on time!",
@@ -1056,6 +1184,7 @@ class GameWindow:
                     if self.black_time <= 0:
                         self.black_time = 0
                         self.game.result = "White wins on time"
+                        self.dirty = True
                         self.winning_dialog = WinningDialog(
                             pygame.Rect(WINDOW_WIDTH//2 - 150, WINDOW_HEIGHT//2 - 100, 300, 200),
                             "White wins on time!",
@@ -1064,21 +1193,30 @@ class GameWindow:
                         )
 
     def draw_side_panel(self) -> None:
-        board_y = (WINDOW_HEIGHT - BOARD_SIZE) // 2
-        panel_x = BOARD_SIZE + 80
-        panel_width = WINDOW_WIDTH - panel_x - 40
-        panel_rect = pygame.Rect(panel_x, board_y, panel_width, BOARD_SIZE)
-        
-        s = pygame.Surface((panel_rect.width, panel_rect.height))
-        s.set_alpha(200)
-        s.fill((0, 0, 0))
-        self.screen.blit(s, (panel_rect.x, panel_rect.y))
+        """Blits the side panel, re-rasterizing it only when something it shows has changed."""
+        clock = None
+        if self.time_control is not None:
+            clock = (int(self.white_time), int(self.black_time))
+        log = self.game.move_log
+        # Moves, undo (a new log list), results, clock seconds and piece style cover everything drawn
+        key = (
+            id(log), len(log), self.game.result, clock,
+            self.board_renderer.piece_images.mode, self.current_piece_set,
+        )
+        if self.panel_surface is None or key != self.panel_key:
+            self.panel_surface = self.render_side_panel()
+            self.panel_key = key
+        self.screen.blit(self.panel_surface, (self.side_panel_rect.x, self.side_panel_rect.y))
+
+    def render_side_panel(self) -> pygame.Surface:
+        panel_rect = self.side_panel_rect
+        panel = self.panel_backdrop.copy()
         
-        y = panel_rect.y + 10
+        y = 10
         
         # 1. Game Info Title
-        text = self.side_font.render("Game Info", True, TEXT_COLOR)
-        self.screen.blit(text, (panel_rect.x + 10, y))
+        text = render_text(self.side_font, "Game Info", TEXT_COLOR)
+        panel.blit(text, (10, y))
         y += 30
         
         # 2. Clocks (New UI)
@@ -1108,25 +1246,25 @@ class GameWindow:
             
             # Draw White Clock
             clock_h = 40
-            pygame.draw.rect(self.screen, w_bg_color, (panel_rect.x + 10, y, 120, clock_h))
-            pygame.draw.rect(self.screen, w_border, (panel_rect.x + 10, y, 120, clock_h), 2)
-            lbl = self.side_font.render(f"White: {w_time_str}", True, w_text_color)
-            self.screen.blit(lbl, (panel_rect.x + 20, y + 10))
+            pygame.draw.rect(panel, w_bg_color, (10, y, 120, clock_h))
+            pygame.draw.rect(panel, w_border, (10, y, 120, clock_h), 2)
+            lbl = render_text(self.side_font, f"White: {w_time_str}", w_text_color)
+            panel.blit(lbl, (20, y + 10))
             
             y += clock_h + 10
             
             # Draw Black Clock
-            pygame.draw.rect(self.screen, b_bg_color, (panel_rect.x + 10, y, 120, clock_h))
-            pygame.draw.rect(self.screen, b_border, (panel_rect.x + 10, y, 120, clock_h), 2)
-            lbl = self.side_font.render(f"Black: {b_time_str}", True, b_text_color)
-            self.screen.blit(lbl, (panel_rect.x + 20, y + 10))
+            pygame.draw.rect(panel, b_bg_color, (10, y, 120, clock_h))
+            pygame.draw.rect(panel, b_border, (10, y, 120, clock_h), 2)
+            lbl = render_text(self.side_font, f"Black: {b_time_str}", b_text_color)
+            panel.blit(lbl, (20, y + 10))
             
             y += clock_h + 20
         
         # 3. Turn Indicator
         turn_str = "White" if self.game.board.current_player is Color.WHITE else "Black"
-        text = self.side_font.render("Turn: " + turn_str, True, TEXT_COLOR)
-        self.screen.blit(text, (panel_rect.x + 10, y))
+        text = render_text(self.side_font, "Turn: " + turn_str, TEXT_COLOR)
+        panel.blit(text, (10, y))
         y += 24
         
         # 4. Status
@@ -1140,14 +1278,14 @@ class GameWindow:
         elif self.game.is_in_check():
             status = "Check"
             
-        status_surf = self.side_font.render(f"Status: {status}", True, TEXT_COLOR)
-        self.screen.blit(status_surf, (panel_rect.x + 10, y))
+        status_surf = render_text(self.side_font, f"Status: {status}", TEXT_COLOR)
+        panel.blit(status_surf, (10, y))
         y += 30
         
         # 5. Captured Pieces
         def draw_captured(label, pieces, start_y):
-            lbl = self.side_font.render(label, True, TEXT_COLOR)
-            self.screen.blit(lbl, (panel_rect.x + 10, start_y))
+            lbl = render_text(self.side_font, label, TEXT_COLOR)
+            panel.blit(lbl, (10, start_y))
             start_y += 22
             
             if not pieces:
@@ -1162,16 +1300,15 @@ class GameWindow:
             if required_width > available_width and count > 1:
                 step = (available_width - icon_size) / (count - 1)
             
-            start_x = panel_rect.x + 10
+            start_x = 10
+            piece_images = self.board_renderer.piece_images
+            row_blits = []
             for i, piece in enumerate(pieces):
-                image = self.board_renderer.piece_images.get(piece)
-                if image is not None:
-                    small = pygame.transform.smoothscale(
-                        image,
-                        (icon_size, icon_size),
-                    )
-                    rect_img = small.get_rect(topleft=(int(start_x + i * step), start_y))
-                    self.screen.blit(small, rect_img)
+                small = piece_images.get_thumb(piece, icon_size)
+                if small is not None:
+                    row_blits.append((small, (int(start_x + i * step), start_y)))
+            # One call for the whole row instead of a blit per piece
+            panel.blits(row_blits, doreturn=False)
             return start_y + 35
 
         y = draw_captured("Captured White:", self.game.captured_white, y)
@@ -1180,31 +1317,61 @@ class GameWindow:
         y += 10
         
         # 6. Move Log
-        text = self.side_font.render("Moves:", True, TEXT_COLOR)
-        self.screen.blit(text, (panel_rect.x + 10, y))
+        text = render_text(self.side_font, "Moves:", TEXT_COLOR)
+        panel.blit(text, (10, y))
         y += 22
         
+        for glyph in self.move_log_glyphs():
+            panel.blit(glyph, (10, y))
+            y += 18
+        return panel
+
+    def move_log_glyphs(self) -> List[pygame.Surface]:
+        """Rendered lines for the tail of the move log, re-rendering only lines that changed."""
+        log = self.game.move_log
+        # Moves append to the log and undo swaps in a shorter copy, so this changes with every edit
+        key = (id(log), len(log))
+        if key == self.move_log_key:
+            return self.move_log_surfaces
+        
         formatted_lines = []
-        for i in range(0, len(self.game.move_log), 2):
+        for i in range(0, len(log), 2):
             move_num = i // 2 + 1
-            white_move = self.game.move_log[i]
-            if i + 1 < len(self.game.move_log):
-                black_move = self.game.move_log[i+1]
+            white_move = log[i]
+            if i + 1 < len(log):
+                black_move = log[i+1]
                 formatted_lines.append(f"{move_num}. {white_move} {black_move}")
             else:
                 formatted_lines.append(f"{move_num}. {white_move}")
                 
         max_lines = 8 # Reduced lines to fit clock
-        start_idx = max(0, len(formatted_lines) - max_lines)
-        display_lines = formatted_lines[start_idx:]
+        display_lines = formatted_lines[-max_lines:]
         
+        # Lines are unique (numbered), so earlier renders can be reused by text
+        cache: Dict[str, pygame.Surface] = {}
         for line in display_lines:
-            glyph = self.small_font.render(line, True, TEXT_COLOR)
-            self.screen.blit(glyph, (panel_rect.x + 10, y))
-            y += 18
+            glyph = self.move_line_cache.get(line)
+            if glyph is None:
+                glyph = self.small_font.render(line, True, TEXT_COLOR)
+            cache[line] = glyph
+        self.move_line_cache = cache
+        self.move_log_surfaces = [cache[line] for line in display_lines]
+        self.move_log_key = key
+        return self.move_log_surfaces
 
     def handle_events(self) -> None:
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        # Hover state only depends on where the mouse ended up, so of a burst of
+        # motion events only the last one is dispatched to the hover handlers
+        last_motion = None
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                last_motion = event
+        for event in events:
+            if event.type == pygame.MOUSEMOTION and event is not last_motion:
+                continue
+            # Any input or engine event may change what is on screen
+            self.dirty = True
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -1213,9 +1380,11 @@ class GameWindow:
                     self.apply_move_and_schedule_ai(event.move, animate=True)
             
             if event.type == USEREVENT_HINT_READY:
-                move = event.move
-                self.interaction.hint_move = move
-                self.message_overlay.show("Suggested move " + self.move_text(move), frames=180)
+                # Ignore hints computed for a position that has since changed
+                if event.position_key == self.game.board.zobrist_key():
+                    move = event.move
+                    self.interaction.hint_move = move
+                    self.message_overlay.show("Suggested move " + self.move_text(move), frames=180)
 
             if self.winning_dialog is not None:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -1237,11 +1406,9 @@ class GameWindow:
                     if self.interaction.dragging and self.interaction.selected:
                         pass
                 elif self.state == "menu":
-                    for b in self.menu_buttons:
-                        b.handle_mouse_move(pos)
+                    hover_buttons(self.menu_buttons, self.menu_bbox, pos)
                 elif self.state == "difficulty":
-                    for b in self.difficulty_buttons:
-                        b.handle_mouse_move(pos)
+                    hover_buttons(self.difficulty_buttons, self.difficulty_bbox, pos)
                 elif self.state == "settings":
                     for b in self.settings_buttons:
                         b.handle_mouse_move(pos)
@@ -1313,7 +1480,7 @@ class GameWindow:
                 rect = self.logo_image.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 150))
                 self.screen.blit(self.logo_image, rect)
             else:
-                title = self.title_font.render("Chess Game", True, (255, 255, 255))
+                title = self.render_title("Chess Game")
                 rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 150))
                 self.screen.blit(title, rect)
                 
@@ -1323,7 +1490,7 @@ class GameWindow:
             pygame.display.flip()
             return
         if self.state == "difficulty":
-            title = self.title_font.render("Select Difficulty", True, (255, 255, 255))
+            title = self.render_title("Select Difficulty")
             rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 260))
             self.screen.blit(title, rect)
             for b in self.difficulty_buttons:
@@ -1332,7 +1499,7 @@ class GameWindow:
             pygame.display.flip()
             return
         if self.state == "settings":
-            title = self.title_font.render("Settings", True, (255, 255, 255))
+            title = self.render_title("Settings")
             self.screen.blit(title, (40, 30))
             
             for b in self.settings_tab_buttons:
@@ -1377,7 +1544,7 @@ class GameWindow:
             pygame.display.flip()
             return
         if self.state == "color_selection":
-            title = self.title_font.render("Choose Your Side", True, (255, 255, 255))
+            title = self.render_title("Choose Your Side")
             rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 100))
             self.screen.blit(title, rect)
             for b in self.color_buttons:
@@ -1386,7 +1553,7 @@ class GameWindow:
             pygame.display.flip()
             return
         if self.state == "clock_selection":
-            title = self.title_font.render("Select Time Control", True, (255, 255, 255))
+            title = self.render_title("Select Time Control")
             rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 250))
             self.screen.blit(title, rect)
             for b in self.clock_buttons:
@@ -1397,14 +1564,7 @@ class GameWindow:
 
         king_pos = None
         if self.game.is_in_check():
-            for row in range(8):
-                for col in range(8):
-                    piece = self.game.board.get_piece(row, col)
-                    if piece is not None and piece.color is self.game.board.current_player and piece.kind is PieceType.KING:
-                        king_pos = (row, col)
-                        break
-                if king_pos is not None:
-                    break
+            king_pos = locate_king(self.game.board, self.game.board.current_player)
         hide_pieces: Set[Tuple[int, int]] = set()
         if self.current_animation is not None:
             move = self.current_animation.move
@@ -1426,32 +1586,28 @@ class GameWindow:
             highlight_check=self.settings["highlight_check"]
         )
         
+        # The cached panel is blitted opaque, so a dragged piece goes on top of it
+        self.draw_side_panel()
         if self.interaction.dragging and self.interaction.drag_piece:
             image = self.board_renderer.piece_images.get(self.interaction.drag_piece)
             if image:
                 mouse_pos = pygame.mouse.get_pos()
                 rect = image.get_rect(center=mouse_pos)
                 self.screen.blit(image, rect)
-
-        self.draw_side_panel()
         self.button_bar.draw(self.screen, self.button_font)
         self.btn_main_menu.draw(self.screen, self.button_font)
         if self.promotion_dialog is not None and self.interaction.awaiting_promotion:
             self.promotion_dialog.draw(self.screen, self.side_font)
         self.message_overlay.draw(self.screen, self.small_font)
         if self.current_animation is not None:
-            t = self.current_animation.progress()
-            for image, start_pos, end_pos in self.current_animation.pieces:
-                x = start_pos[0] + (end_pos[0] - start_pos[0]) * t
-                y = start_pos[1] + (end_pos[1] - start_pos[1]) * t
-                rect = image.get_rect(center=(int(x), int(y)))
+            t = self.current_animation.current_t
+            for image, start_pos, delta, rect in self.current_animation.pieces:
+                rect.center = (int(start_pos[0] + delta[0] * t), int(start_pos[1] + delta[1] * t))
+                self.screen.blit(image, rect)
+            alpha = int(255 * (1.0 - t))
+            for image, rect in self.current_animation.captured_overlays:
+                image.set_alpha(alpha)
                 self.screen.blit(image, rect)
-            for image, pos in self.current_animation.captured_overlays:
-                alpha_t = 1.0 - t
-                temp = image.copy()
-                temp.set_alpha(int(255 * alpha_t))
-                rect = temp.get_rect(center=(int(pos[0]), int(pos[1])))
-                self.screen.blit(temp, rect)
         
         if self.game.result and self.winning_dialog is None:
             if self.mode_human_vs_ai:
@@ -1472,6 +1628,23 @@ class GameWindow:
 
         pygame.display.flip()
 
+    def needs_redraw(self) -> bool:
+        """Redraw after input, while something animates (plus one frame after), or when a clock's second changes."""
+        # Board animations only advance in the playing state; a paused one must not repaint the menus
+        animating = self.state == "playing" and (
+            self.current_animation is not None
+            or self.message_overlay.frames_remaining > 0
+            or self.board_renderer.invalid_flash_frames > 0
+        )
+        clock = None
+        if self.state == "playing" and self.time_control is not None:
+            clock = (int(self.white_time), int(self.black_time))
+        redraw = self.dirty or animating or self._was_animating or clock != self._drawn_clock
+        self.dirty = False
+        self._was_animating = animating
+        self._drawn_clock = clock
+        return redraw
+
     def run(self) -> None:
         while self.running:
             self.handle_events()
@@ -1479,8 +1652,14 @@ class GameWindow:
             if self.state == "playing":
                 self.update_game_logic()
             
-            self.draw()
-            self.clock.tick(60)
+            if self.needs_redraw():
+                self.draw()
+            # Menus only change on input, so they poll at a lower rate; a moving piece
+            # gets the precise (busy-waiting) limiter so its frames stay evenly spaced
+            if self.state == "playing" and self.current_animation is not None:
+                self.clock.tick_busy_loop(60)
+            else:
+                self.clock.tick(60 if self.state == "playing" else 30)
         
         # Cleanup
         if self.engine:
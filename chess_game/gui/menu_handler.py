@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional, Callable
+from typing import List, Tuple, Optional, Callable, Dict
 import pygame
 
 
@@ -10,6 +10,7 @@ class Button:
         callback: Callable[[], None],
         selected: bool = False,
         icon: Optional[pygame.Surface] = None,
+        key: Optional[str] = None,
     ) -> None:
         self.rect = rect
         self.label = label
@@ -17,13 +18,18 @@ class Button:
         self.hover = False
         self.selected = selected
         self.icon = icon
+        # Identifies what the button controls, e.g. "theme:Green", for in-place refreshes
+        self.key = key
+        # Pre-rendered face per state; dropped when the font or label changes
+        self._faces: Dict[str, pygame.Surface] = {}
+        self._face_key: Optional[Tuple[pygame.font.Font, str]] = None
 
-    def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
-        if self.selected:
+    def _render_face(self, font: pygame.font.Font, state: str) -> pygame.Surface:
+        if state == "selected":
             color = (46, 204, 113)  # Green for selected
             text_color = (255, 255, 255)
             border_color = (255, 255, 255)
-        elif self.hover:
+        elif state == "hover":
             color = (90, 90, 90)
             text_color = (255, 255, 255)
             border_color = (180, 180, 180)
@@ -32,39 +38,60 @@ class Button:
             text_color = (220, 220, 220)
             border_color = (100, 100, 100)
 
+        width, height = self.rect.width, self.rect.height
+        # Extra rows below the body hold the drop shadow
+        face = pygame.Surface((width, height + 3), pygame.SRCALPHA)
+        body = pygame.Rect(0, 0, width, height)
+
         # Shadow
-        shadow_rect = self.rect.copy()
-        shadow_rect.y += 3
-        pygame.draw.rect(surface, (20, 20, 20), shadow_rect, border_radius=8)
+        pygame.draw.rect(face, (20, 20, 20), pygame.Rect(0, 3, width, height), border_radius=8)
 
         # Main Body
-        pygame.draw.rect(surface, color, self.rect, border_radius=8)
+        pygame.draw.rect(face, color, body, border_radius=8)
         
         # Border
-        pygame.draw.rect(surface, border_color, self.rect, 2 if self.selected else 1, border_radius=8)
+        pygame.draw.rect(face, border_color, body, 2 if state == "selected" else 1, border_radius=8)
 
         if self.icon:
             # Draw icon on left or center if no label
-            icon_rect = self.icon.get_rect(midleft=(self.rect.x + 12, self.rect.centery))
-            surface.blit(self.icon, icon_rect)
+            icon_rect = self.icon.get_rect(midleft=(12, height // 2))
+            face.blit(self.icon, icon_rect)
             # Draw label to right of icon
             if self.label:
                 text = font.render(self.label, True, text_color)
                 # Center text in remaining space
-                remaining_w = self.rect.width - (icon_rect.right - self.rect.x)
+                remaining_w = width - icon_rect.right
                 center_x = icon_rect.right + remaining_w // 2
-                text_rect = text.get_rect(center=(center_x, self.rect.centery))
-                surface.blit(text, text_rect)
+                text_rect = text.get_rect(center=(center_x, height // 2))
+                face.blit(text, text_rect)
         else:
             text = font.render(self.label, True, text_color)
-            rect = text.get_rect(center=self.rect.center)
-            surface.blit(text, rect)
+            rect = text.get_rect(center=(width // 2, height // 2))
+            face.blit(text, rect)
             
         # Hover glow effect (subtle)
-        if self.hover and not self.selected:
-             glow = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        if state == "hover":
+             glow = pygame.Surface((width, height), pygame.SRCALPHA)
              pygame.draw.rect(glow, (255, 255, 255, 30), glow.get_rect(), border_radius=8)
-             surface.blit(glow, self.rect)
+             face.blit(glow, (0, 0))
+        return face
+
+    def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> None:
+        if self.selected:
+            state = "selected"
+        elif self.hover:
+            state = "hover"
+        else:
+            state = "normal"
+        key = (font, self.label)
+        if self._face_key != key:
+            self._faces.clear()
+            self._face_key = key
+        face = self._faces.get(state)
+        if face is None:
+            face = self._render_face(font, state)
+            self._faces[state] = face
+        surface.blit(face, (self.rect.x, self.rect.y))
 
     def handle_mouse_move(self, pos: Tuple[int, int]) -> None:
         self.hover = self.rect.collidepoint(pos)
@@ -74,6 +101,22 @@ class Button:
             self.callback()
 
 
+def buttons_bbox(buttons: List[Button]) -> Optional[pygame.Rect]:
+    if not buttons:
+        return None
+    return buttons[0].rect.unionall([b.rect for b in buttons[1:]])
+
+
+def hover_buttons(buttons: List[Button], bbox: Optional[pygame.Rect], pos: Tuple[int, int]) -> None:
+    """Updates hover for a group, rejecting positions outside its bounding box with one test."""
+    if bbox is not None and not bbox.collidepoint(pos):
+        for button in buttons:
+            button.hover = False
+        return
+    for button in buttons:
+        button.handle_mouse_move(pos)
+
+
 class ButtonBar:
     def __init__(self, rect: pygame.Rect) -> None:
         self.rect = rect
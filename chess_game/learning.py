@@ -177,9 +177,9 @@ class ChessLearningSystem:
         if not candidates:
             return None
             
-        # Sort by score then popularity
-        candidates.sort(key=lambda x: (x[1], x[2]), reverse=True)
-        return candidates[0][0]
+        # Best by score then popularity; only the top entry is needed, so no full sort
+        best = max(candidates, key=lambda x: (x[1], x[2]))
+        return best[0]
 
     def get_blunder_penalty(self, board_key: str, move: Move) -> int:
         """Return penalty score if move is a known blunder."""
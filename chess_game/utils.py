@@ -37,6 +37,21 @@ class Move:
 file_labels = "abcdefgh"
 
 
+if hasattr(int, "bit_count"):
+    def popcount(value: int) -> int:
+        return value.bit_count()
+else:
+    def popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+def iter_bits(value: int):
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
 def square_to_indices(square: str) -> Optional[Tuple[int, int]]:
     if len(square) != 2:
         return None
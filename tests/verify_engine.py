@@ -0,0 +1,116 @@
+import sys
+import os
+import stat
+import shutil
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chess_game.engine import lc0_engine
+from chess_game.engine.lc0_engine import LC0Engine
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Minimal UCI engine. The --weights file holds how long its first search takes;
+# later searches answer at once. Searches run one at a time in order, like a real
+# engine, and "stop" ends the current one early. The reply identifies the position:
+# "a2a3 ponder a7a6" from the bare root, "e7e5" once moves follow it.
+FAKE_ENGINE = textwrap.dedent('''
+    import queue
+    import sys
+    import threading
+
+    with open(sys.argv[1].split("=", 1)[1]) as f:
+        first_delay = float(f.read().strip() or 0)
+
+    out_lock = threading.Lock()
+    jobs = queue.Queue()
+
+    def say(text):
+        with out_lock:
+            sys.stdout.write(text + "\\n")
+            sys.stdout.flush()
+
+    def worker():
+        while True:
+            move, wait, stop_evt = jobs.get()
+            stop_evt.wait(wait)
+            say("bestmove " + move)
+
+    threading.Thread(target=worker, daemon=True).start()
+    move = "a2a3 ponder a7a6"
+    delay = first_delay
+    stop_evt = threading.Event()
+    for line in sys.stdin:
+        cmd = line.strip()
+        if cmd == "uci":
+            say("id name fake")
+            say("uciok")
+        elif cmd == "isready":
+            say("readyok")
+        elif cmd.startswith("position"):
+            move = "e7e5" if " moves " in cmd else "a2a3 ponder a7a6"
+        elif cmd.startswith("go"):
+            stop_evt = threading.Event()
+            jobs.put((move, delay, stop_evt))
+            delay = 0
+        elif cmd == "stop":
+            stop_evt.set()
+        elif cmd == "quit":
+            break
+''')
+
+
+@unittest.skipIf(os.name == 'nt', "fake engine is launched through a shebang script")
+class TestLC0Engine(unittest.TestCase):
+    def start_engine(self, first_delay: float) -> LC0Engine:
+        exe = os.path.join(self.tmp_dir, "fake_lc0")
+        with open(exe, "w") as f:
+            f.write(f"#!{sys.executable}\n" + FAKE_ENGINE)
+        os.chmod(exe, os.stat(exe).st_mode | stat.S_IXUSR)
+        weights = os.path.join(self.tmp_dir, "weights.txt")
+        with open(weights, "w") as f:
+            f.write(str(first_delay))
+        with patch.object(lc0_engine, "LC0_EXE", exe), patch.object(lc0_engine, "NETWORK_PATH", weights):
+            engine = LC0Engine()
+        self.addCleanup(engine.quit)
+        return engine
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+
+    def test_bestmove_token(self):
+        """Test the move is sliced out of bestmove lines with and without ponder."""
+        print("\nTesting Bestmove Parsing...")
+        engine = self.start_engine(0)
+        self.assertEqual(engine.get_best_move(START_FEN, {'movetime': 100}), "a2a3")
+        self.assertEqual(engine.get_best_move(START_FEN, {'movetime': 100}, ["e2e4"]), "e7e5")
+
+    def test_timed_out_search_does_not_answer_next_position(self):
+        """Test a late bestmove from an abandoned search isn't returned for the next one."""
+        print("\nTesting Search Timeout Recovery...")
+        engine = self.start_engine(3.0)
+        self.assertIsNone(engine.get_best_move(START_FEN, {'movetime': 100}))
+        self.assertTrue(engine.soft_reset())
+        self.assertEqual(engine.get_best_move(START_FEN, {'movetime': 100}, ["e2e4"]), "e7e5")
+
+    def test_validate_fen(self):
+        """Test FEN validation accepts full and clockless FENs and rejects malformed ones."""
+        print("\nTesting FEN Validation...")
+        engine = self.start_engine(0)
+        self.assertTrue(engine._validate_fen(START_FEN))
+        self.assertTrue(engine._validate_fen("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3"))
+        self.assertFalse(engine._validate_fen("rnbqkbnr/ppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"))
+        self.assertFalse(engine._validate_fen("rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"))
+        self.assertFalse(engine._validate_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1"))
+        self.assertFalse(engine._validate_fen(START_FEN + "\nquit"))
+        self.assertIsNone(engine.get_best_move("not a fen", {'movetime': 100}))
+
+
+if __name__ == '__main__':
+    unittest.main()
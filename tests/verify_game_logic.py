@@ -1,7 +1,6 @@
 import sys
 import os
 import unittest
-import queue
 from unittest.mock import MagicMock, patch
 
 # Add project root to path
@@ -62,9 +61,6 @@ class TestGameWindowLogic(unittest.TestCase):
         # Ensure we are in a known state
         self.window.mode_human_vs_ai = True
         self.window.new_game()
-        # Mock the AI Queue to be immediate for testing logic
-        self.window.ai_move_queue = MagicMock()
-        self.window.ai_move_queue.get_nowait.side_effect = queue.Empty
 
     def test_turn_state_initialization(self):
         """Test if turn states are initialized correctly."""
@@ -171,6 +167,42 @@ class TestGameWindowLogic(unittest.TestCase):
         # Check time
         self.assertAlmostEqual(self.window.white_time, 59.0, delta=0.1, msg="White clock should decrease by 1s")
 
+    def test_flag_fall_requests_redraw(self):
+        """Test that running out of time redraws even with no input or clock-second change."""
+        print("\nTesting Flag Fall Redraw...")
+        self.window.state = "playing"
+        self.window.time_control = 60
+        self.window.white_time = 0.5
+        self.window.black_time = 60
+        self.window.turn_state = TURN_PLAYER
+        self.window.ai_thread = None
+        self.window.current_animation = None
+        self.window.game.board.current_player = Color.WHITE
+        self.window.game.result = None
+
+        # The last frame drawn already showed 00:00, with the new-game banner gone
+        self.window.message_overlay.frames_remaining = 0
+        self.window.needs_redraw()
+        self.assertFalse(self.window.needs_redraw())
+
+        self.window.last_frame_time = 1000
+        pygame.time.get_ticks.return_value = 2000
+        self.window.update_game_logic()
+
+        self.assertEqual(self.window.game.result, "Black wins on time")
+        self.assertIsNotNone(self.window.winning_dialog)
+        self.assertTrue(self.window.needs_redraw(), "Flag fall should be drawn without waiting for input")
+
+    def test_paused_animation_does_not_repaint_menus(self):
+        """Test that a move animation left behind by opening Settings doesn't keep menus redrawing."""
+        print("\nTesting Paused Animation Redraw...")
+        self.window.current_animation = MagicMock()
+        self.window.message_overlay.frames_remaining = 0
+        self.window.state = "settings"
+
+        self.window.needs_redraw()
+        self.assertFalse(self.window.needs_redraw(), "Settings should only redraw on input")
+
     def test_input_lock(self):
         """Test that input is ignored during TURN_AI."""
         print("\nTesting Input Lock...")
@@ -0,0 +1,100 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from chess_game.game_logic import Game, generate_legal_moves, make_move, unmake_move
+from chess_game.utils import Move
+
+
+def perft(board, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in generate_legal_moves(board):
+        undo = make_move(board, move)
+        nodes += perft(board, depth - 1)
+        unmake_move(board, move, undo)
+    return nodes
+
+
+class TestMoveGeneration(unittest.TestCase):
+    def test_perft_from_start(self):
+        """Test legal move counts from the initial position."""
+        print("\nTesting Perft From Start...")
+        board = Game().board
+        self.assertEqual(perft(board, 1), 20)
+        self.assertEqual(perft(board, 2), 400)
+        self.assertEqual(perft(board, 3), 8902)
+
+    def test_unmake_restores_board(self):
+        """Test that make_move followed by unmake_move restores the position."""
+        print("\nTesting Make/Unmake Round Trip...")
+        game = Game()
+        # 1. e4 d5 2. exd5 c5 leaves an en passant capture on c6
+        for move in (Move(6, 4, 4, 4), Move(1, 3, 3, 3), Move(4, 4, 3, 3), Move(1, 2, 3, 2)):
+            self.assertTrue(game.apply_move(move))
+        board = game.board
+        fen_before = board.to_fen()
+        key_before = board.zobrist_key()
+        for move in generate_legal_moves(board):
+            undo = make_move(board, move)
+            unmake_move(board, move, undo)
+            self.assertEqual(board.to_fen(), fen_before, f"Board changed after {move}")
+            self.assertEqual(board.zobrist_key(), key_before)
+
+    def test_threefold_repetition(self):
+        """Test that shuffling knights back and forth is a draw by repetition."""
+        print("\nTesting Threefold Repetition...")
+        game = Game()
+        shuffle = (Move(7, 6, 5, 5), Move(0, 6, 2, 5), Move(5, 5, 7, 6), Move(2, 5, 0, 6))
+        for _ in range(2):
+            for move in shuffle:
+                self.assertTrue(game.apply_move(move))
+        self.assertEqual(game.result, "Draw by threefold repetition")
+
+    def test_uci_moves_from_start(self):
+        """Test the root FEN and UCI move list handed to the engine."""
+        print("\nTesting UCI Move History...")
+        game = Game()
+        start = game.board.to_fen()
+        for move in (Move(6, 4, 4, 4), Move(1, 4, 3, 4), Move(7, 6, 5, 5)):
+            self.assertTrue(game.apply_move(move))
+        self.assertEqual(game.start_fen(), start)
+        self.assertEqual(game.uci_moves(), ["e2e4", "e7e5", "g1f3"])
+        game.undo_last_move()
+        self.assertEqual(game.uci_moves(), ["e2e4", "e7e5"])
+
+    def test_legal_moves_from_tracks_position(self):
+        """Test the per-source legal move index follows moves and undo."""
+        print("\nTesting Legal Moves By Source...")
+        game = Game()
+        self.assertEqual(len(game.legal_moves_from(7, 6)), 2)
+        self.assertEqual(game.legal_moves_from(7, 5), [])
+        self.assertTrue(game.apply_move(Move(6, 4, 4, 4)))
+        self.assertEqual(len(game.legal_moves_from(0, 6)), 2)
+        self.assertEqual(game.legal_moves_from(7, 5), [])
+        game.undo_last_move()
+        self.assertEqual(len(game.legal_moves_from(7, 5)), 0)
+        self.assertEqual(len(game.legal_moves_from(6, 4)), 2)
+
+    def test_legal_moves_between_groups_promotions(self):
+        """Test the (source, target) index returns one move or all promotion choices."""
+        print("\nTesting Legal Moves By Route...")
+        game = Game()
+        self.assertEqual(len(game.legal_moves_between(6, 4, 4, 4)), 1)
+        self.assertEqual(game.legal_moves_between(6, 4, 3, 4), [])
+        # 1. h4 g5 2. hxg5 Nc6 3. g6 Nb4 4. gxh7 Nd5 leaves hxg8 promotions; h8 is blocked
+        for move in (Move(6, 7, 4, 7), Move(1, 6, 3, 6), Move(4, 7, 3, 6), Move(0, 1, 2, 2),
+                     Move(3, 6, 2, 6), Move(2, 2, 4, 1), Move(2, 6, 1, 7), Move(4, 1, 3, 3)):
+            self.assertTrue(game.apply_move(move))
+        promotions = game.legal_moves_between(1, 7, 0, 6)
+        self.assertEqual(len(promotions), 4)
+        self.assertTrue(all(m.promotion is not None for m in promotions))
+        self.assertEqual(game.legal_moves_between(1, 7, 0, 7), [])
+
+
+if __name__ == '__main__':
+    unittest.main()